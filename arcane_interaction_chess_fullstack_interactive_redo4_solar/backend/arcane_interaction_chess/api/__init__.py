@@ -8,6 +8,6 @@ structures:
 """
 
 from .facade import ArcaneEngine
-from .serde import move_to_dict, dict_to_move, snapshot, move_to_uci
+from .serde import move_to_dict, dict_to_move, snapshot, move_to_uci, move_to_compact
 
-__all__ = ["ArcaneEngine", "move_to_dict", "dict_to_move", "snapshot", "move_to_uci"]
+__all__ = ["ArcaneEngine", "move_to_dict", "dict_to_move", "snapshot", "move_to_uci", "move_to_compact"]
@@ -6,6 +6,10 @@ from typing import Any, Dict, List, Optional, Tuple, Type
 
 from ..core.types import Color, sq_name, FILES
 from ..core.moves import (
+    KIND_CASTLE,
+    KIND_ENPASSANT,
+    KIND_PROMOTION,
+    KIND_REMOTE_CAPTURE,
     Move,
     NormalMove,
     EnPassantMove,
@@ -96,18 +100,49 @@ def move_to_uci(m: Move) -> str:
     """
     fr = _sq_to_alg(m.from_sq)
     to = _sq_to_alg(m.to_sq)
+    kind = m.KIND
     promo = ""
-    if isinstance(m, PromotionMove):
+    if kind == KIND_PROMOTION:
         name = getattr(m.promote_to, "__name__", "Queen")
         promo = name[0].lower()  # q/r/b/n
 
     # remote capture suffix
-    if RemoteCaptureMove is not None and isinstance(m, RemoteCaptureMove):
+    if kind == KIND_REMOTE_CAPTURE:
         return f"{fr}{to}{promo}@{_sq_to_alg(m.origin_sq)}"
 
     return f"{fr}{to}{promo}"
 
 
+_FLAG_BITS: Dict[str, int] = {"double_pawn_push": 1, "remote_capture": 2}
+
+
+def move_to_compact(m: Move) -> List[Any]:
+    """Positional wire form: ``[KIND, from_sq, to_sq, flag_bits, *extra]``.
+
+    ``extra`` is ``[captured_sq]`` for en passant, ``[rook_from, rook_to]`` for
+    castling, ``[piece_letter]`` for promotion and ``[origin_sq]`` for remote
+    captures; empty for normal moves.
+    """
+    bits = 0
+    for f in getattr(m, "flags", ()) or ():
+        try:
+            bits |= _FLAG_BITS[f]
+        except KeyError:
+            raise ValueError(f"Unknown move flag: {f!r}") from None
+    kind = m.KIND
+    out: List[Any] = [kind, m.from_sq, m.to_sq, bits]
+    if kind == KIND_ENPASSANT:
+        out.append(m.captured_sq)
+    elif kind == KIND_CASTLE:
+        out.append(m.rook_from)
+        out.append(m.rook_to)
+    elif kind == KIND_PROMOTION:
+        out.append(getattr(m.promote_to, "__name__", "Queen")[0].lower())
+    elif kind == KIND_REMOTE_CAPTURE:
+        out.append(m.origin_sq)
+    return out
+
+
 def dict_to_move(d: Dict[str, Any]) -> Move:
     kind = d.get("kind", "normal")
 
@@ -148,8 +183,8 @@ def dict_to_move(d: Dict[str, Any]) -> Move:
     raise ValueError(f"Unknown move kind: {kind!r}")
 
 
-def snapshot(game) -> Dict[str, Any]:
-    """JSON-friendly snapshot of current match state."""
+def snapshot_pieces(game) -> List[Dict[str, Any]]:
+    """Just the `pieces` list of `snapshot`, enough to feed `facade.diff`."""
 
     pieces: List[Dict[str, Any]] = []
     for p in game.board._pieces.values():
@@ -165,11 +200,16 @@ def snapshot(game) -> Dict[str, Any]:
                 "symbol": p.symbol,
             }
         )
+    return sorted(pieces, key=lambda x: (x["color"], x["type"], x["pos"]))
+
+
+def snapshot(game) -> Dict[str, Any]:
+    """JSON-friendly snapshot of current match state."""
 
     out: Dict[str, Any] = {
         "side_to_move": _color_to_str(game.side_to_move),
         "last_move": move_to_dict(game.last_move) if game.last_move is not None else None,
-        "pieces": sorted(pieces, key=lambda x: (x["color"], x["type"], x["pos"])),
+        "pieces": snapshot_pieces(game),
         "ply": len(getattr(game, "_stack", [])),
         "halfmove_clock": int(getattr(game, "halfmove_clock", 0)),
         "fullmove_number": int(getattr(game, "fullmove_number", 1)),
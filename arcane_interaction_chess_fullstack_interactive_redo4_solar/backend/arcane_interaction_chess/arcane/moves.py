@@ -3,13 +3,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional, TYPE_CHECKING
 
-from ..core.moves import Move, Undo
+from ..core.moves import KIND_REMOTE_CAPTURE, Move, Undo
 
 if TYPE_CHECKING:
     from ..core.game import Game
 
 @dataclass(frozen=True)
 class RemoteCaptureMove(Move):
+    KIND = KIND_REMOTE_CAPTURE
+
     origin_sq: int = -1  # adjacent ally square used as the virtual capture origin
 
     def apply(self, game: "Game") -> Undo:
@@ -1,7 +1,10 @@
 from .types import Color, sq, file_of, rank_of, in_bounds, sq_name
 from .piece import Piece
 from .board import Board
-from .moves import Move, NormalMove, EnPassantMove, CastleMove, PromotionMove, Undo
+from .moves import (
+    Move, NormalMove, EnPassantMove, CastleMove, PromotionMove, Undo,
+    KIND_NORMAL, KIND_CASTLE, KIND_ENPASSANT, KIND_PROMOTION, KIND_REMOTE_CAPTURE,
+)
 from .game import Game, Listener
 from .rules import KingSafetyRule
 from .pieces import King, Queen, Rook, Bishop, Knight, Pawn
@@ -12,6 +15,7 @@ __all__ = [
     "Color","sq","file_of","rank_of","in_bounds","sq_name",
     "Piece","Board",
     "Move","NormalMove","EnPassantMove","CastleMove","PromotionMove","Undo",
+    "KIND_NORMAL","KIND_CASTLE","KIND_ENPASSANT","KIND_PROMOTION","KIND_REMOTE_CAPTURE",
     "Game","Listener","KingSafetyRule",
     "King","Queen","Rook","Bishop","Knight","Pawn",
     "PositionTracker",
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import fields, is_dataclass
+from dataclasses import is_dataclass
 from typing import Iterable, List, Optional, TYPE_CHECKING
 
 from .types import Color
@@ -9,6 +9,7 @@ from .moves import Move, Undo
 from .events import MoveWillApply, MoveApplied, MoveUndone
 from .rules import Rule, KingSafetyRule
 
+
 class Listener:
     def on_event(self, game: "Game", event: object) -> None:
         return
@@ -94,14 +95,8 @@ class Game:
 
     @staticmethod
     def moves_equal(left: Move, right: Move) -> bool:
-        if left.__class__ is not right.__class__:
-            return False
-        if not (is_dataclass(left) and is_dataclass(right)):
-            return False
-        for f in fields(left):
-            if getattr(left, f.name) != getattr(right, f.name):
-                return False
-        return True
+        # Moves are frozen dataclasses: the generated __eq__ compares the compare=True fields.
+        return left.__class__ is right.__class__ and is_dataclass(left) and left == right
 
     def push_checked(self, move: Move) -> None:
         for candidate in self.legal_moves_iter(self.side_to_move):
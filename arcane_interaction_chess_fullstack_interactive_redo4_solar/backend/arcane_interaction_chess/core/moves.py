@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional, Tuple, Type, TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -10,8 +10,18 @@ if TYPE_CHECKING:
 
 ChangedPieceState = Tuple["Piece", int, bool, int]
 
+# Move kind tags. Hot paths (SAN/UCI emission) branch on `move.KIND` equality
+# instead of isinstance chains.
+KIND_NORMAL = 0
+KIND_CASTLE = 1
+KIND_ENPASSANT = 2
+KIND_PROMOTION = 3
+KIND_REMOTE_CAPTURE = 4
+
 @dataclass(frozen=True)
 class Move:
+    KIND = KIND_NORMAL
+
     from_sq: int
     to_sq: int
     flags: Tuple[str, ...] = ()
@@ -48,6 +58,8 @@ class NormalMove(Move):
 
 @dataclass(frozen=True)
 class EnPassantMove(Move):
+    KIND = KIND_ENPASSANT
+
     captured_sq: int = -1
 
     def apply(self, game: "Game") -> "Undo":
@@ -75,8 +87,15 @@ class EnPassantMove(Move):
 
 @dataclass(frozen=True)
 class CastleMove(Move):
+    KIND = KIND_CASTLE
+
     rook_from: int = -1
     rook_to: int = -1
+    # Derived at construction: king lands on the g-file for O-O, c-file for O-O-O.
+    is_kingside: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "is_kingside", (self.to_sq & 7) == 6)
 
     def apply(self, game: "Game") -> "Undo":
         board = game.board
@@ -105,6 +124,8 @@ class CastleMove(Move):
 
 @dataclass(frozen=True)
 class PromotionMove(Move):
+    KIND = KIND_PROMOTION
+
     promote_to: Type["Piece"] = None  # type: ignore[assignment]
 
     def apply(self, game: "Game") -> "Undo":
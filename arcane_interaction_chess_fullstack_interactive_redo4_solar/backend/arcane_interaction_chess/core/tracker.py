@@ -77,14 +77,25 @@ class PositionTracker(Listener):
         self._att_dirty = True
 
     def compute_hash(self, game) -> int:
+        return self._hash_with(game, self.castle_rights, self.ep_file)
+
+    def position_key(self, game) -> int:
+        """Zobrist key derived purely from the board, without touching tracker state.
+
+        Quiet push/pop bypasses listeners, so ``self.hash`` is stale inside
+        quiet searches; castle rights and the ep file are recomputed here.
+        """
+        return self._hash_with(game, self._compute_castle_rights(game), self._compute_ep_file(game))
+
+    def _hash_with(self, game, castle_rights: int, ep_file: Optional[int]) -> int:
         h = 0
         for p in game.board._pieces.values():
             h ^= self._psq_key(p, p.pos)
         if game.side_to_move is Color.BLACK:
             h ^= self.side_key
-        h ^= self._castle_hash(self.castle_rights)
-        if self.ep_file is not None:
-            h ^= self.ep_file_keys[self.ep_file]
+        h ^= self._castle_hash(castle_rights)
+        if ep_file is not None:
+            h ^= self.ep_file_keys[ep_file]
         return h
 
     def _color_index(self, c: Color) -> int:
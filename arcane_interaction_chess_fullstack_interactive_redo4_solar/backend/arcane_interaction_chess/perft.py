@@ -1,27 +1,65 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 from .core import Game
 from .uci import move_to_uci
 
 
-def perft(game: Game, depth: int) -> int:
+def perft(game: Game, depth: int, tt: Optional[Dict[Tuple[int, int], int]] = None) -> int:
     """Performance test: count leaf nodes to `depth` from current game state.
 
     Uses quiet push/pop for speed and to avoid emitting arcane events.
+    Pass a dict as `tt` to memoize subtree counts by (Zobrist key, depth);
+    this requires an attached PositionTracker and is skipped otherwise. The key
+    ignores arcane piece state, so only use a table for plain chess positions.
     """
     if depth <= 0:
         return 1
-    moves = game.legal_moves_iter(game.side_to_move)
+    key = None
+    if tt is not None:
+        tracker = game.tracker
+        if tracker is not None:
+            key = (tracker.position_key(game), depth)
+            hit = tt.get(key)
+            if hit is not None:
+                return hit
     if depth == 1:
-        return sum(1 for _ in moves)
-    total = 0
-    for m in moves:
+        # Still stored: transpositions first appear three plies in, so depth-1 counts are the
+        # entries a shallow search actually reuses.
+        total = sum(1 for _ in game.legal_moves_iter(game.side_to_move))
+    else:
+        total = 0
+        for m in game.legal_moves_iter(game.side_to_move):
+            game.push_quiet(m)
+            total += perft(game, depth - 1, tt)
+            game.pop_quiet()
+    if key is not None:
+        tt[key] = total
+    return total
+
+
+def perft_counts(game: Game, max_depth: int) -> List[int]:
+    """Leaf counts for every depth 1..max_depth from a single traversal.
+
+    ``perft_counts(g, 3)[d - 1] == perft(g, d)`` without re-walking the
+    shallower plies for each depth.
+    """
+    counts = [0] * max(max_depth, 0)
+    if counts:
+        _perft_counts(game, 0, counts)
+    return counts
+
+
+def _perft_counts(game: Game, ply: int, counts: List[int]) -> None:
+    if ply + 1 == len(counts):
+        counts[ply] += sum(1 for _ in game.legal_moves_iter(game.side_to_move))
+        return
+    for m in game.legal_moves_iter(game.side_to_move):
+        counts[ply] += 1
         game.push_quiet(m)
-        total += perft(game, depth - 1)
+        _perft_counts(game, ply + 1, counts)
         game.pop_quiet()
-    return total
 
 
 def perft_divide(game: Game, depth: int) -> Dict[str, int]:
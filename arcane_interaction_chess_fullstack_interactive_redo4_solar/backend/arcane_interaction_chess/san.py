@@ -4,7 +4,7 @@ from typing import List, Optional, Tuple, Type
 
 from .core import (
     Game, Color, Move,
-    NormalMove, EnPassantMove, CastleMove, PromotionMove,
+    KIND_CASTLE, KIND_ENPASSANT, KIND_PROMOTION,
     sq_name, file_of, rank_of,
     Pawn, Knight, Bishop, Rook, Queen, King,
 )
@@ -37,9 +37,11 @@ def to_san(game: Game, move: Move) -> str:
 
     For arcane-specific move kinds (e.g. remote_capture), this falls back to UCI-ish notation.
     """
+    kind = move.KIND
+
     # Castling
-    if isinstance(move, CastleMove):
-        san = "O-O" if file_of(move.to_sq) == 6 else "O-O-O"
+    if kind == KIND_CASTLE:
+        san = "O-O" if move.is_kingside else "O-O-O"
         # check/mate suffix
         game.push_quiet(move)
         suffix = _check_suffix(game)
@@ -54,7 +56,7 @@ def to_san(game: Game, move: Move) -> str:
     piece_letter = _PIECE_LETTER.get(mover_cls, mover_cls.__name__[0].upper())
 
     # capture detection (before applying)
-    is_capture = game.board.piece_at(move.to_sq) is not None or isinstance(move, EnPassantMove)
+    is_capture = game.board.piece_at(move.to_sq) is not None or kind == KIND_ENPASSANT
 
     # disambiguation for non-pawns
     disamb = ""
@@ -73,7 +75,7 @@ def to_san(game: Game, move: Move) -> str:
         san = f"{piece_letter}{disamb}{'x' if is_capture else ''}{dest}"
 
     # promotion
-    if isinstance(move, PromotionMove):
+    if kind == KIND_PROMOTION:
         san += "=" + _promotion_letter(move.promote_to)
 
     # check/mate
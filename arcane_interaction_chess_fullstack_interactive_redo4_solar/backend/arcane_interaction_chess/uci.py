@@ -5,16 +5,22 @@ from typing import List, Optional, Tuple
 
 from .core import (
     Game, Color, setup_standard, PositionTracker,
-    Move, NormalMove, EnPassantMove, CastleMove, PromotionMove, sq_name
+    Move, KIND_PROMOTION, sq_name
 )
 from .core import Queen, Rook, Bishop, Knight
 from .fen import parse_fen, STARTPOS_FEN
 from .engine import Engine
 
 
+# UCI output is pure ASCII: pre-encode the fixed responses and write bytes directly.
+_UCIOK = b"id name ArcaneInteractionChess\nid author Sashy\nuciok\n"
+_READYOK = b"readyok\n"
+_NULL_BESTMOVE = b"bestmove 0000\n"
+
+
 def move_to_uci(m: Move) -> str:
     s = f"{sq_name(m.from_sq)}{sq_name(m.to_sq)}".lower()
-    if isinstance(m, PromotionMove):
+    if m.KIND == KIND_PROMOTION:
         promo = m.promote_to
         ch = "q"
         if promo is Rook:
@@ -72,6 +78,9 @@ def _parse_position(tokens: List[str]) -> Game:
 def main() -> int:
     eng = Engine()
     game = _new_startpos_game()
+    out = sys.stdout.buffer
+    write = out.write
+    flush = out.flush
 
     while True:
         line = sys.stdin.readline()
@@ -84,14 +93,12 @@ def main() -> int:
         cmd = parts[0]
 
         if cmd == "uci":
-            print("id name ArcaneInteractionChess")
-            print("id author Sashy")
-            print("uciok")
-            sys.stdout.flush()
+            write(_UCIOK)
+            flush()
 
         elif cmd == "isready":
-            print("readyok")
-            sys.stdout.flush()
+            write(_READYOK)
+            flush()
 
         elif cmd == "ucinewgame":
             game = _new_startpos_game()
@@ -110,10 +117,10 @@ def main() -> int:
             time_limit = None if movetime_ms is None else movetime_ms / 1000.0
             best = eng.best_move(game, depth=depth, time_limit_s=time_limit)
             if best is None:
-                print("bestmove 0000")
+                write(_NULL_BESTMOVE)
             else:
-                print(f"bestmove {move_to_uci(best)}")
-            sys.stdout.flush()
+                write(("bestmove " + move_to_uci(best) + "\n").encode("ascii"))
+            flush()
 
         elif cmd == "quit":
             break
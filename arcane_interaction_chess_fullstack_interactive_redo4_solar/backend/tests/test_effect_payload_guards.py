@@ -1,3 +1,4 @@
+import functools
 import importlib.util
 import sys
 import unittest
@@ -7,6 +8,7 @@ from pathlib import Path
 SENTINEL = object()
 
 
+@functools.lru_cache(maxsize=1)
 def _load_frontend_server_module():
     root = Path(__file__).resolve().parents[2]
     mod_path = root / "frontend" / "server.py"
@@ -14,7 +16,7 @@ def _load_frontend_server_module():
     if spec is None or spec.loader is None:
         raise RuntimeError("Unable to load frontend server module")
     module = importlib.util.module_from_spec(spec)
-    sys.modules.setdefault("frontend_server_effect_guards", module)
+    sys.modules["frontend_server_effect_guards"] = module
     spec.loader.exec_module(module)
     return module
 
@@ -1,8 +1,13 @@
+import copy
+import functools
+import http.client
 import importlib.util
+import io
 import json
-import os
+import pickle
 import sys
 import threading
+import time
 import unittest
 import urllib.error
 import urllib.request
@@ -12,13 +17,53 @@ from arcane_interaction_chess.core import Game, setup_standard
 from arcane_interaction_chess.core.moves import NormalMove
 from arcane_interaction_chess.core.types import FILES, sq
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - stdlib fallback
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
+EMPTY_POST = b"{}"
+
+
+class _FakeConnection:
+    """Socket stand-in so Handler can be driven in-process without binding a port."""
+
+    def __init__(self, raw_request: bytes) -> None:
+        self._rfile = io.BufferedReader(io.BytesIO(raw_request))
+        self.sent = bytearray()
+        self._timeout = None
+
+    def makefile(self, mode, *args, **kwargs):
+        return self._rfile
+
+    def sendall(self, data) -> None:
+        self.sent += data
+
+    def settimeout(self, value) -> None:
+        self._timeout = value
+
+    def gettimeout(self):
+        return self._timeout
+
+    def setsockopt(self, *args) -> None:
+        pass
+
+
+_FILE_IDX = {f: i for i, f in enumerate(FILES)}
+_SQ_LUT = {f + str(r + 1): sq(_FILE_IDX[f], r) for f in FILES for r in range(8)}
+
 
 def _sq(alg: str) -> int:
-    file_idx = FILES.index(alg[0])
-    rank_idx = int(alg[1]) - 1
-    return sq(file_idx, rank_idx)
+    return _SQ_LUT[alg]
 
 
+@functools.lru_cache(maxsize=1)
 def _load_frontend_server_module():
     root = Path(__file__).resolve().parents[2]
     mod_path = root / "frontend" / "server.py"
@@ -26,49 +71,90 @@ def _load_frontend_server_module():
     if spec is None or spec.loader is None:
         raise RuntimeError("Unable to load frontend server module")
     module = importlib.util.module_from_spec(spec)
-    sys.modules.setdefault("frontend_server", module)
+    sys.modules["frontend_server"] = module
     spec.loader.exec_module(module)
     return module
 
 
 class TestIllegalInputRejected(unittest.TestCase):
-    def _post_json(self, url: str, payload: dict):
+    server_module = None
+    httpd = None
+    thread = None
+    base = ""
+    _engine_template = None
+
+    @classmethod
+    def setUpClass(cls):
+        # One module load and one live server for the whole class; per-test state is reset in setUp.
+        cls.server_module = _load_frontend_server_module()
+        cls.httpd = cls.server_module.PooledHTTPServer(("127.0.0.1", 0), cls.server_module.Handler)
+        cls.thread = threading.Thread(target=cls.httpd.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.httpd.server_port}"
+        template = cls.server_module.ServerEngine.standard_demo_game()
+        try:
+            cls._engine_template = pickle.dumps(template)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            cls._engine_template = template
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+        cls.thread.join(timeout=2)
+
+    def setUp(self):
+        state = self.server_module.STATE
+        template = self._engine_template
+        if isinstance(template, bytes):
+            state.engine = pickle.loads(template)
+        else:
+            state.engine = copy.deepcopy(template)
+        state.pending = None
+        state.pending_move = None
+
+    def _post_json(self, url: str, payload):
+        # Pre-encoded bytes (e.g. EMPTY_POST) are sent as-is.
+        data = payload if isinstance(payload, bytes) else _dumps(payload)
         req = urllib.request.Request(
             url,
-            data=json.dumps(payload).encode("utf-8"),
+            data=data,
             headers={"Content-Type": "application/json"},
             method="POST",
         )
         try:
             with urllib.request.urlopen(req) as resp:
-                return resp.status, json.loads(resp.read().decode("utf-8"))
+                return resp.status, _loads(resp.read())
         except urllib.error.HTTPError as exc:
-            body = json.loads(exc.read().decode("utf-8"))
-            return int(exc.code), body
+            return int(exc.code), _loads(exc.read())
+
+    def _dispatch_in_process(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        raw = (
+            f"{method} {path} HTTP/1.1\r\n"
+            "Host: 127.0.0.1\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        ).encode("ascii") + body
+        conn = _FakeConnection(raw)
+        self.server_module.Handler(conn, ("127.0.0.1", 0), self.httpd)
+        head, _, payload = bytes(conn.sent).partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        return status, _loads(payload)
 
     def _get_json(self, url: str):
         req = urllib.request.Request(url, method="GET")
         try:
             with urllib.request.urlopen(req) as resp:
-                return resp.status, json.loads(resp.read().decode("utf-8"))
+                return resp.status, _loads(resp.read())
         except urllib.error.HTTPError as exc:
-            body = exc.read().decode("utf-8")
+            raw = exc.read()
             try:
-                payload = json.loads(body)
-            except json.JSONDecodeError:
-                payload = {"raw": body}
+                payload = _loads(raw)
+            except ValueError:
+                payload = {"raw": raw.decode("utf-8", "replace")}
             return int(exc.code), payload
 
-    def _start_server(self, server_module):
-        server_module.STATE.engine = server_module.ServerEngine.standard_demo_game()
-        server_module.STATE.pending = None
-        server_module.STATE.pending_move = None
-
-        httpd = server_module.ThreadingHTTPServer(("127.0.0.1", 0), server_module.Handler)
-        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
-        thread.start()
-        return httpd, thread
-
     def test_push_rejects_opposite_color_piece(self):
         g = Game()
         setup_standard(g)
@@ -78,38 +164,40 @@ class TestIllegalInputRejected(unittest.TestCase):
     def test_push_checked_rejects_illegal_knight_and_king_moves(self):
         g = Game()
         setup_standard(g)
-        with self.assertRaisesRegex(ValueError, "Illegal move"):
+        with self.assertRaises(ValueError) as cm:
             g.push_checked(NormalMove(_sq("b1"), _sq("b4")))
-        with self.assertRaisesRegex(ValueError, "Illegal move"):
+        self.assertIn("Illegal move", str(cm.exception))
+        with self.assertRaises(ValueError) as cm:
             g.push_checked(NormalMove(_sq("e1"), _sq("e3")))
+        self.assertIn("Illegal move", str(cm.exception))
 
     def test_server_engine_rejects_malformed_and_mismatched_move_fields(self):
-        server_module = _load_frontend_server_module()
-        engine = server_module.ServerEngine.standard_demo_game()
+        engine = self.server_module.ServerEngine.standard_demo_game()
 
-
-        with self.assertRaisesRegex(ValueError, "Illegal move"):
+        with self.assertRaises(ValueError) as cm:
             engine.apply({"kind": "normal", "from_alg": "e7", "to_alg": "e6"})
+        self.assertIn("Illegal move", str(cm.exception))
 
-        with self.assertRaisesRegex(ValueError, "Illegal move"):
+        with self.assertRaises(ValueError) as cm:
             engine.apply({"kind": "normal", "from_alg": "b1", "to_alg": "b4"})
+        self.assertIn("Illegal move", str(cm.exception))
 
-        with self.assertRaisesRegex(ValueError, "Illegal move"):
+        with self.assertRaises(ValueError) as cm:
             engine.apply({"kind": "promotion", "from_alg": "e2", "to_alg": "e4", "promote_to": "Queen"})
+        self.assertIn("Illegal move", str(cm.exception))
 
-        with self.assertRaisesRegex(ValueError, "Illegal move"):
+        with self.assertRaises(ValueError) as cm:
             engine.apply({"kind": "normal", "from_alg": "e2", "to_alg": "e4", "flags": ["bogus"]})
+        self.assertIn("Illegal move", str(cm.exception))
 
     def test_server_engine_undo_empty_stack_raises_value_error(self):
-        server_module = _load_frontend_server_module()
-        engine = server_module.ServerEngine.standard_demo_game()
+        engine = self.server_module.ServerEngine.standard_demo_game()
 
         with self.assertRaisesRegex(ValueError, "No moves to undo"):
             engine.undo()
 
     def test_server_engine_undo_reverts_last_move(self):
-        server_module = _load_frontend_server_module()
-        engine = server_module.ServerEngine.standard_demo_game()
+        engine = self.server_module.ServerEngine.standard_demo_game()
 
         move = engine.legal_moves()[0]
         applied = engine.apply(move)
@@ -117,145 +205,239 @@ class TestIllegalInputRejected(unittest.TestCase):
         self.assertEqual(applied["meta"]["applied"]["to_alg"], move["to_alg"])
 
         undone = engine.undo()
+        self.assertNotIn("before", undone)
         self.assertIsNone(undone["after"]["last_move"])
         self.assertEqual(undone["meta"]["undone"]["move"]["from_alg"], move["from_alg"])
         self.assertEqual(undone["meta"]["undone"]["move"]["to_alg"], move["to_alg"])
 
-    def test_api_apply_returns_400_for_illegal_input(self):
-        server_module = _load_frontend_server_module()
-        httpd, thread = self._start_server(server_module)
+    def test_server_engine_legal_move_by_uci(self):
+        engine = self.server_module.ServerEngine.standard_demo_game()
+
+        move = engine.legal_move_by_uci("e2e4")
+        self.assertIn(move, engine.legal_move_objects())
+        self.assertIsNone(engine.legal_move_by_uci("e2e5"))
+        engine.apply(engine.legal_moves()[0])
+        self.assertIsNone(engine.legal_move_by_uci("e2e4"))
+        self.assertIsNotNone(engine.legal_move_by_uci("e7e5"))
+
+    def test_server_engine_state_is_memoized_per_version(self):
+        engine = self.server_module.ServerEngine.standard_demo_game()
+
+        first = engine.state()
+        self.assertIs(engine.state(), first)
+        etag, body = engine.state_body()
+        self.assertEqual(engine.published_state_body(), (etag, body))
+        self.assertEqual(_loads(body)["state"], first)
+
+        v0 = engine.version
+        applied = engine.apply(engine.legal_moves()[0])
+        self.assertGreater(engine.version, v0)
+        self.assertIsNot(engine.state(), first)
+        self.assertIs(engine.state(), applied["after"])
+        self.assertIsNone(engine.published_state_body())
+        self.assertEqual(engine.state()["side_to_move"], "BLACK")
+        self.assertIn("diff", applied)
+        self.assertNotIn("diff", engine.apply(engine.legal_moves()[0], diff=False))
+
+        engine.undo()
+        engine.undo()
+        self.assertEqual(engine.state()["side_to_move"], "WHITE")
+        self.assertIsNone(engine.state()["last_move"])
 
-        try:
-            url = f"http://127.0.0.1:{httpd.server_port}/api/apply"
-            payload = json.dumps({"move": {"kind": "normal", "from_alg": "e7", "to_alg": "e6"}}).encode("utf-8")
-            req = urllib.request.Request(
-                url,
-                data=payload,
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            with self.assertRaises(urllib.error.HTTPError) as exc:
-                urllib.request.urlopen(req)
-            self.assertEqual(exc.exception.code, 400)
-        finally:
-            httpd.shutdown()
-            httpd.server_close()
-            thread.join(timeout=2)
+    def test_api_apply_returns_400_for_illegal_input(self):
+        url = f"{self.base}/api/apply"
+        payload = _dumps({"move": {"kind": "normal", "from_alg": "e7", "to_alg": "e6"}})
+        req = urllib.request.Request(
+            url,
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with self.assertRaises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(req)
+        self.assertEqual(exc.exception.code, 400)
 
     def test_api_undo_empty_returns_400_with_error_payload(self):
-        server_module = _load_frontend_server_module()
-        httpd, thread = self._start_server(server_module)
+        status, body = self._post_json(f"{self.base}/api/undo", EMPTY_POST)
+        self.assertEqual(status, 400)
+        self.assertEqual(body.get("ok"), False)
+        self.assertIsInstance(body.get("error"), str)
+        self.assertEqual(body.get("error"), "No moves to undo")
+
+    def test_api_state_revalidates_with_etag(self):
+        with urllib.request.urlopen(f"{self.base}/api/state") as resp:
+            etag = resp.headers["ETag"]
+            resp.read()
+        self.assertTrue(etag)
+        req = urllib.request.Request(f"{self.base}/api/state", headers={"If-None-Match": etag})
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            urllib.request.urlopen(req)
+        self.assertEqual(cm.exception.code, 304)
+
+        self._post_json(f"{self.base}/api/apply", {"move": self._get_json(f"{self.base}/api/legal")[1]["moves"][0]})
+        with urllib.request.urlopen(req) as resp:
+            self.assertEqual(resp.status, 200)
+            self.assertNotEqual(resp.headers["ETag"], etag)
+            self.assertEqual(_loads(resp.read())["state"]["side_to_move"], "BLACK")
+
+    def test_api_legal_compact_matches_dict_moves(self):
+        status, full = self._get_json(f"{self.base}/api/legal")
+        self.assertEqual(status, 200)
+        status, compact = self._get_json(f"{self.base}/api/legal?compact=1")
+        self.assertEqual(status, 200)
+        self.assertTrue(compact.get("compact"))
+        self.assertEqual(len(compact["moves"]), len(full["moves"]))
+        pairs = {(m["from"], m["to"]) for m in full["moves"]}
+        self.assertEqual({(m[1], m[2]) for m in compact["moves"]}, pairs)
+        double_pushes = [m for m in compact["moves"] if m[3] & 1]
+        self.assertEqual(len(double_pushes), 8)
+
+        status, uci = self._get_json(f"{self.base}/api/legal?fmt=uci")
+        self.assertEqual(status, 200)
+        self.assertEqual(uci["fmt"], "uci")
+        self.assertEqual(sorted(uci["moves"]), sorted(m["from_alg"] + m["to_alg"] for m in full["moves"]))
+
+    def test_api_bundle_combines_state_legal_and_pending(self):
+        status, bundle = self._get_json(f"{self.base}/api/bundle")
+        self.assertEqual(status, 200)
+        _, state = self._get_json(f"{self.base}/api/state")
+        _, legal = self._get_json(f"{self.base}/api/legal")
+        self.assertEqual(bundle["state"], state["state"])
+        self.assertEqual(bundle["moves"], legal["moves"])
+        self.assertIsNone(bundle["pending"])
+
+        status, partial = self._get_json(f"{self.base}/api/bundle?parts=pending")
+        self.assertEqual(status, 200)
+        self.assertNotIn("state", partial)
+        self.assertNotIn("moves", partial)
+
+        status, body = self._get_json(f"{self.base}/api/bundle?parts=state,bogus")
+        self.assertEqual(status, 400)
+        self.assertEqual(body.get("ok"), False)
+
+    def test_api_undo_after_apply_returns_200_with_result(self):
+        legal_status, legal_body = self._get_json(f"{self.base}/api/legal")
+        self.assertEqual(legal_status, 200)
+        self.assertTrue(legal_body.get("ok"))
+        move = legal_body["moves"][0]
+
+        apply_status, apply_body = self._post_json(
+            f"{self.base}/api/apply",
+            {"move": move},
+        )
+        self.assertEqual(apply_status, 200)
+        self.assertTrue(apply_body.get("ok"))
+        self.assertNotIn("before", apply_body["result"])
+        self.assertIsInstance(apply_body["result"]["v"], int)
+
+        status, body = self._post_json(f"{self.base}/api/undo", EMPTY_POST)
+        self.assertEqual(status, 200)
+        self.assertTrue(body.get("ok"))
+        self.assertIn("result", body)
+        self.assertEqual(body["result"]["meta"]["undone"]["move"]["from_alg"], move["from_alg"])
+        self.assertEqual(body["result"]["meta"]["undone"]["move"]["to_alg"], move["to_alg"])
+
+    def test_api_apply_batch_applies_moves_in_order(self):
+        scratch = self.server_module.ServerEngine.standard_demo_game()
+        first = scratch.legal_moves()[0]
+        scratch.apply(first)
+        second = scratch.legal_moves()[0]
+
+        status, body = self._post_json(f"{self.base}/api/apply_batch", {"moves": [first, second, first]})
+        self.assertEqual(status, 400)
+        self.assertEqual(body.get("index"), 2)
+        self.assertIn("Illegal move", body.get("error"))
+        self.assertEqual([m["applied"] for m in body["metas"]], [first, second])
+        self.assertEqual(body["state"]["side_to_move"], "WHITE")
+        self.assertEqual(body["state"]["ply"], 2)
 
+    def test_api_reset_rejects_oversized_payload_with_413(self):
+        old_limit = self.server_module._MAX_BYTES
+        self.server_module._MAX_BYTES = 16
         try:
-            status, body = self._post_json(f"http://127.0.0.1:{httpd.server_port}/api/undo", {})
-            self.assertEqual(status, 400)
+            status, body = self._dispatch_in_process("POST", "/api/reset", _dumps({"pad": "x" * 128}))
+            self.assertEqual(status, 413)
             self.assertEqual(body.get("ok"), False)
-            self.assertIsInstance(body.get("error"), str)
-            self.assertEqual(body.get("error"), "No moves to undo")
         finally:
-            httpd.shutdown()
-            httpd.server_close()
-            thread.join(timeout=2)
+            self.server_module._MAX_BYTES = old_limit
 
-    def test_api_undo_after_apply_returns_200_with_result(self):
-        server_module = _load_frontend_server_module()
-        httpd, thread = self._start_server(server_module)
+    def test_api_decide_returns_503_when_saturated(self):
+        old_slots = self.server_module._DECIDE_SLOTS
+        self.server_module._DECIDE_SLOTS = threading.BoundedSemaphore(1)
+        self.server_module._DECIDE_SLOTS.acquire()
+        try:
+            status, body = self._dispatch_in_process("POST", "/api/decide", _dumps({"id": "x", "choice": None}))
+            self.assertEqual(status, 503)
+            self.assertEqual(body.get("ok"), False)
+        finally:
+            self.server_module._DECIDE_SLOTS = old_slots
 
+    def test_idle_keepalive_connections_do_not_starve_pool(self):
+        idle = []
         try:
-            base = f"http://127.0.0.1:{httpd.server_port}"
-            legal_status, legal_body = self._get_json(f"{base}/api/legal")
-            self.assertEqual(legal_status, 200)
-            self.assertTrue(legal_body.get("ok"))
-            move = legal_body["moves"][0]
-
-            apply_status, apply_body = self._post_json(
-                f"{base}/api/apply",
-                {"move": move},
-            )
-            self.assertEqual(apply_status, 200)
-            self.assertTrue(apply_body.get("ok"))
-
-            status, body = self._post_json(f"{base}/api/undo", {})
+            for _ in range(self.server_module._http_pool_size()):
+                conn = http.client.HTTPConnection("127.0.0.1", self.httpd.server_port, timeout=5)
+                conn.request("GET", "/api/defs")
+                resp = conn.getresponse()
+                resp.read()
+                self.assertFalse(resp.will_close)
+                idle.append(conn)
+
+            start = time.monotonic()
+            status, body = self._get_json(f"{self.base}/api/state")
             self.assertEqual(status, 200)
             self.assertTrue(body.get("ok"))
-            self.assertIn("result", body)
-            self.assertEqual(body["result"]["meta"]["undone"]["move"]["from_alg"], move["from_alg"])
-            self.assertEqual(body["result"]["meta"]["undone"]["move"]["to_alg"], move["to_alg"])
+            self.assertLess(time.monotonic() - start, 3.0)
         finally:
-            httpd.shutdown()
-            httpd.server_close()
-            thread.join(timeout=2)
-
-    def test_api_reset_rejects_oversized_payload_with_413(self):
-        server_module = _load_frontend_server_module()
-        old_limit = os.environ.get("ARCANE_HTTP_MAX")
-        os.environ["ARCANE_HTTP_MAX"] = "16"
-        httpd, thread = self._start_server(server_module)
+            for conn in idle:
+                conn.close()
 
+    def test_first_request_may_arrive_after_keepalive_idle_window(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.httpd.server_port, timeout=5)
         try:
-            url = f"http://127.0.0.1:{httpd.server_port}/api/reset"
-            payload = json.dumps({"pad": "x" * 128}).encode("utf-8")
-            req = urllib.request.Request(
-                url,
-                data=payload,
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            with self.assertRaises(urllib.error.HTTPError) as exc:
-                urllib.request.urlopen(req)
-            self.assertEqual(exc.exception.code, 413)
+            conn.connect()
+            time.sleep(self.server_module._KEEPALIVE_IDLE + 0.3)
+            conn.request("GET", "/api/state")
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, 200)
+            self.assertTrue(_loads(resp.read()).get("ok"))
         finally:
-            if old_limit is None:
-                os.environ.pop("ARCANE_HTTP_MAX", None)
-            else:
-                os.environ["ARCANE_HTTP_MAX"] = old_limit
-            httpd.shutdown()
-            httpd.server_close()
-            thread.join(timeout=2)
+            conn.close()
 
-    def test_api_reset_rejects_invalid_json_with_400(self):
-        server_module = _load_frontend_server_module()
-        httpd, thread = self._start_server(server_module)
+    def test_api_get_key_error_is_logged_as_500(self):
+        routes = self.server_module._GET_ROUTES
+
+        def broken(handler):
+            return {}["missing"]
 
+        routes["/api/broken"] = broken
         try:
-            url = f"http://127.0.0.1:{httpd.server_port}/api/reset"
-            payload = b'{"broken": '
-            req = urllib.request.Request(
-                url,
-                data=payload,
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            with self.assertRaises(urllib.error.HTTPError) as exc:
-                urllib.request.urlopen(req)
-            self.assertEqual(exc.exception.code, 400)
+            with self.assertLogs(self.server_module.LOGGER, "ERROR"):
+                status, body = self._dispatch_in_process("GET", "/api/broken", b"")
         finally:
-            httpd.shutdown()
-            httpd.server_close()
-            thread.join(timeout=2)
+            del routes["/api/broken"]
+        self.assertEqual(status, 500)
+        self.assertEqual(body.get("error"), "Internal server error")
 
-    def test_api_reset_accepts_normal_payload(self):
-        server_module = _load_frontend_server_module()
-        httpd, thread = self._start_server(server_module)
+    def test_api_reset_rejects_invalid_json_with_400(self):
+        status, body = self._dispatch_in_process("POST", "/api/reset", b'{"broken": ')
+        self.assertEqual(status, 400)
+        self.assertEqual(body.get("ok"), False)
 
-        try:
-            url = f"http://127.0.0.1:{httpd.server_port}/api/reset"
-            payload = b"{}"
-            req = urllib.request.Request(
-                url,
-                data=payload,
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            with urllib.request.urlopen(req) as resp:
-                self.assertEqual(resp.status, 200)
-                body = json.loads(resp.read().decode("utf-8"))
-            self.assertTrue(body.get("ok"))
-            self.assertIn("state", body)
-        finally:
-            httpd.shutdown()
-            httpd.server_close()
-            thread.join(timeout=2)
+    def test_api_reset_accepts_normal_payload(self):
+        url = f"{self.base}/api/reset"
+        payload = EMPTY_POST
+        req = urllib.request.Request(
+            url,
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(req) as resp:
+            self.assertEqual(resp.status, 200)
+            body = _loads(resp.read())
+        self.assertTrue(body.get("ok"))
+        self.assertIn("state", body)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
+from bisect import bisect_left
 from pathlib import Path
+import mmap
+import re
 import unittest
 
 
@@ -12,23 +15,25 @@ ALLOWED_PATTERNS = {
     "except Exception:\n            LOGGER.exception(\"json_read_unhandled\"",
     "except Exception:\n            LOGGER.exception(\"api_post_unhandled\"",
 }
+_ALLOWED_BYTES = tuple(pattern.encode("utf-8") for pattern in ALLOWED_PATTERNS)
+_BROAD_EXCEPT_RE = re.compile(rb"except Exception:")
+_NEWLINE_RE = re.compile(rb"\n")
 
 
 class TestNoBroadExceptHotPaths(unittest.TestCase):
     def test_no_new_bare_broad_catches_in_hot_paths(self):
         violations = []
         for path in HOT_PATHS:
-            content = path.read_text(encoding="utf-8")
-            idx = 0
-            while True:
-                idx = content.find("except Exception:", idx)
-                if idx < 0:
-                    break
-                segment = content[idx: idx + 96]
-                if not any(segment.startswith(allowed) for allowed in ALLOWED_PATTERNS):
-                    line = content.count("\n", 0, idx) + 1
+            with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                newlines = None
+                for match in _BROAD_EXCEPT_RE.finditer(mm):
+                    idx = match.start()
+                    if mm[idx: idx + 96].startswith(_ALLOWED_BYTES):
+                        continue
+                    if newlines is None:
+                        newlines = [m.start() for m in _NEWLINE_RE.finditer(mm)]
+                    line = bisect_left(newlines, idx) + 1
                     violations.append(f"{path.relative_to(ROOT)}:{line}")
-                idx += 1
         self.assertEqual(
             violations,
             [],
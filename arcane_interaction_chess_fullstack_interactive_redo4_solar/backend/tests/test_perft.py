@@ -1,25 +1,58 @@
+import copy
+import functools
 import unittest
 
 from arcane_interaction_chess.fen import parse_fen, STARTPOS_FEN
 from arcane_interaction_chess.core import Game, setup_standard, PositionTracker
-from arcane_interaction_chess.perft import perft
+from arcane_interaction_chess.perft import perft, perft_counts
+
+ROOKS_FEN = "4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1"
+KIWIPETE_FEN = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_cached(fen: str):
+    return parse_fen(fen)
+
+
+class _CountingTT(dict):
+    """Transposition table that records how many lookups found a stored count."""
+
+    hits = 0
+
+    def get(self, key, default=None):
+        value = super().get(key, default)
+        if value is not None:
+            self.hits += 1
+        return value
+
+
+def _game(fen: str):
+    g = copy.deepcopy(_parse_cached(fen))
+    PositionTracker().attach(g)
+    return g
 
 
 class TestPerft(unittest.TestCase):
     def test_startpos(self):
-        g = parse_fen(STARTPOS_FEN)
-        PositionTracker().attach(g)
-        self.assertEqual(perft(g, 1), 20)
-        self.assertEqual(perft(g, 2), 400)
-        self.assertEqual(perft(g, 3), 8902)
+        g = _game(STARTPOS_FEN)
+        self.assertEqual(perft_counts(g, 3), [20, 400, 8902])
+        self.assertEqual(perft(g, 3, {}), 8902)
+
+    def test_tt_reuses_transposed_subtrees(self):
+        g = _game(ROOKS_FEN)
+        counts = perft_counts(g, 4)
+        self.assertEqual(counts, [26, 112, 3189, 17945])
+        tt = _CountingTT()
+        self.assertEqual(perft(g, 4, tt), counts[3])
+        # Rook and king moves transpose three plies in; those depth-1 counts come from the table.
+        self.assertGreater(tt.hits, 0)
+        self.assertLess(len(tt), 1 + sum(counts[:3]))
 
     def test_kiwipete(self):
-        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
-        g = parse_fen(fen)
-        PositionTracker().attach(g)
-        self.assertEqual(perft(g, 1), 48)
-        self.assertEqual(perft(g, 2), 2039)
-        self.assertEqual(perft(g, 3), 97862)
+        g = _game(KIWIPETE_FEN)
+        self.assertEqual(perft_counts(g, 3), [48, 2039, 97862])
+        self.assertEqual(perft(g, 2, {}), 2039)
 
 
 if __name__ == "__main__":
@@ -2,14 +2,16 @@
 from __future__ import annotations
 
 import argparse
-import concurrent.futures
+import asyncio
+import http.client
 import json
+import os
 import random
+import socket
 import subprocess
-import threading
+import sys
 import time
-import urllib.error
-import urllib.request
+import urllib.parse
 from pathlib import Path
 from typing import Any
 
@@ -17,103 +19,238 @@ from typing import Any
 REPO_ROOT = Path(__file__).resolve().parents[2]
 SERVER_PATH = REPO_ROOT / "frontend" / "server.py"
 
+try:
+    import orjson
 
-def _request_json(url: str, payload: dict[str, Any] | None = None, timeout: float = 2.0) -> tuple[int, dict[str, Any]]:
-    body = None if payload is None else json.dumps(payload, separators=(",", ":")).encode("utf-8")
-    req = urllib.request.Request(url, data=body, method="GET" if body is None else "POST")
-    req.add_header("Content-Type", "application/json")
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - stdlib fallback
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+
+UNDO_BODY = b"{}"
+
+
+def _request_json(
+    url: str, payload: dict[str, Any] | bytes | None = None, timeout: float = 2.0
+) -> tuple[int, dict[str, Any]]:
+    """One-shot request for setup calls; the connection is closed so it cannot pin a server worker."""
+    parts = urllib.parse.urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    target = parts.path + ("?" + parts.query if parts.query else "")
+    if payload is None or isinstance(payload, bytes):
+        body = payload
+    else:
+        body = _dumps(payload)
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            status = resp.status
-            raw = resp.read()
-    except urllib.error.HTTPError as e:
-        status = int(e.code)
-        raw = e.read()
-    data = json.loads(raw.decode("utf-8")) if raw else {}
+        conn.request(
+            "GET" if body is None else "POST",
+            target,
+            body,
+            headers={"Content-Type": "application/json", "Connection": "close"},
+        )
+        resp = conn.getresponse()
+        status = resp.status
+        raw = resp.read()
+    finally:
+        conn.close()
+    data = _loads(raw) if raw else {}
     return status, data
 
 
 def _wait_ready(base_url: str, deadline_s: float = 10.0) -> None:
+    parts = urllib.parse.urlsplit(base_url)
+    addr = (parts.hostname or "127.0.0.1", parts.port or 80)
     end = time.monotonic() + deadline_s
+    delay = 0.01
     while time.monotonic() < end:
-        try:
-            status, data = _request_json(f"{base_url}/api/state")
-            if status == 200 and data.get("ok") is True:
-                return
-        except Exception:
-            pass
-        time.sleep(0.05)
+        # Cheap TCP probe first; only issue an HTTP request once the port accepts.
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.05)
+            accepting = sock.connect_ex(addr) == 0
+        if accepting:
+            try:
+                status, data = _request_json(f"{base_url}/api/state")
+                if status == 200 and data.get("ok") is True:
+                    return
+            except Exception:
+                pass
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.2)
     raise RuntimeError("server did not become ready")
 
 
-def _apply_worker(base_url: str, rounds: int, seed: int, errors: list[str], lock: threading.Lock) -> None:
-    rnd = random.Random(seed)
-    for _ in range(rounds):
+class _AsyncClient:
+    """Minimal HTTP/1.1 JSON client on asyncio streams, one connection per worker.
+
+    Reconnects transparently when the server closes the connection after a
+    response (the dev server may answer with HTTP/1.0).
+    """
+
+    def __init__(self, base_url: str, timeout: float = 2.0) -> None:
+        parts = urllib.parse.urlsplit(base_url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def close(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def request_json(
+        self, path: str, payload: dict[str, Any] | bytes | None = None, *, decode: bool = True
+    ) -> tuple[int, Any]:
+        """Return ``(status, body)``; body is the raw bytes when ``decode`` is False."""
         try:
-            status, legal = _request_json(f"{base_url}/api/legal")
-            if status != 200 or legal.get("ok") is not True:
-                continue
-            moves = legal.get("moves") or []
-            if not moves:
-                continue
-            move = moves[rnd.randrange(len(moves))]
-            status, data = _request_json(f"{base_url}/api/apply", {"move": move})
-            if status == 500 or data.get("ok") is False and "error" in data and "Pending decision id mismatch" in str(data.get("error")):
-                with lock:
+            status, raw = await asyncio.wait_for(self._roundtrip(path, payload), self.timeout)
+        except BaseException:
+            await self.close()
+            raise
+        if not decode:
+            return status, raw
+        return status, (_loads(raw) if raw else {})
+
+    async def _roundtrip(self, path: str, payload: dict[str, Any] | bytes | None) -> tuple[int, bytes]:
+        if payload is None or isinstance(payload, bytes):
+            body = payload
+        else:
+            body = _dumps(payload)
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        reader, writer = self._reader, self._writer
+        head = (
+            f"{'GET' if body is None else 'POST'} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {0 if body is None else len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("ascii")
+        writer.write(head if body is None else head + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed connection")
+        version, code, *_ = status_line.decode("latin-1").split(" ", 2)
+        length = None
+        keep_alive = version == "HTTP/1.1"
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            value = value.strip()
+            if name == "content-length":
+                length = int(value)
+            elif name == "connection":
+                keep_alive = value.lower() == "keep-alive"
+        raw = await reader.readexactly(length) if length is not None else await reader.read()
+        if length is None or not keep_alive:
+            await self.close()
+        return int(code), raw
+
+
+async def _apply_worker(base_url: str, rounds: int, seed: int) -> list[str]:
+    rnd = random.Random(seed)
+    errors: list[str] = []
+    client = _AsyncClient(base_url)
+    # Moves from the last /api/legal call. A 200 flips the side to move and "Illegal move" means
+    # another worker moved first, so both refetch; other rejections (e.g. a pending decision)
+    # leave the position unchanged and keep the buffer.
+    local_moves: list[dict[str, Any]] = []
+    try:
+        for _ in range(rounds):
+            try:
+                if not local_moves:
+                    status, legal = await client.request_json("/api/legal")
+                    if status != 200 or legal.get("ok") is not True:
+                        continue
+                    local_moves = list(legal.get("moves") or [])
+                    if not local_moves:
+                        continue
+                move = local_moves.pop(rnd.randrange(len(local_moves)))
+                status, raw = await client.request_json("/api/apply", {"move": move}, decode=False)
+                if status == 200:
+                    local_moves.clear()
+                    continue
+                data = _loads(raw) if raw else {}
+                if 400 <= status < 500 and "Illegal move" in str(data.get("error")):
+                    local_moves.clear()
+                if status == 500 or data.get("ok") is False and "error" in data and "Pending decision id mismatch" in str(data.get("error")):
                     errors.append(f"apply failure status={status} body={data}")
-        except Exception as e:
-            with lock:
-                errors.append(f"apply exception: {e}")
+            except Exception as e:
+                errors.append(f"apply exception: {e!r}")
+    finally:
+        await client.close()
+    return errors
 
 
-def _undo_worker(base_url: str, rounds: int, errors: list[str], lock: threading.Lock) -> None:
-    for _ in range(rounds):
-        try:
-            status, data = _request_json(f"{base_url}/api/undo", {})
-            if status == 500:
-                with lock:
-                    errors.append(f"undo failure status={status} body={data}")
-        except Exception as e:
-            with lock:
-                errors.append(f"undo exception: {e}")
+async def _undo_worker(base_url: str, rounds: int) -> list[str]:
+    errors: list[str] = []
+    client = _AsyncClient(base_url)
+    try:
+        for _ in range(rounds):
+            try:
+                status, raw = await client.request_json("/api/undo", UNDO_BODY, decode=False)
+                if status == 500:
+                    errors.append(f"undo failure status={status} body={raw!r}")
+            except Exception as e:
+                errors.append(f"undo exception: {e!r}")
+    finally:
+        await client.close()
+    return errors
 
 
-def _pending_probe_worker(base_url: str, rounds: int, errors: list[str], lock: threading.Lock) -> None:
+async def _pending_probe_worker(base_url: str, rounds: int) -> list[str]:
+    errors: list[str] = []
+    client = _AsyncClient(base_url)
     last_id: str | None = None
-    for _ in range(rounds):
-        try:
-            status, data = _request_json(f"{base_url}/api/pending")
-            if status != 200 or data.get("ok") is not True:
-                continue
-            pending = data.get("pending")
-            if pending is None:
-                last_id = None
-                continue
-            pid = pending.get("id")
-            if not isinstance(pid, str) or not pid:
-                with lock:
+    try:
+        for _ in range(rounds):
+            try:
+                status, data = await client.request_json("/api/pending")
+                if status != 200 or data.get("ok") is not True:
+                    continue
+                pending = data.get("pending")
+                if pending is None:
+                    last_id = None
+                    continue
+                pid = pending.get("id")
+                if not isinstance(pid, str) or not pid:
                     errors.append(f"invalid pending id payload={pending}")
-            if last_id is not None and pid != last_id:
-                with lock:
+                if last_id is not None and pid != last_id:
                     errors.append(f"pending id changed without clear old={last_id} new={pid}")
-            last_id = pid
-        except Exception as e:
-            with lock:
-                errors.append(f"pending exception: {e}")
+                last_id = pid
+            except Exception as e:
+                errors.append(f"pending exception: {e!r}")
+    finally:
+        await client.close()
+    return errors
+
+
+async def _run_stress_async(base_url: str, apply_workers: int, undo_workers: int, rounds: int, seed: int) -> list[str]:
+    # Each worker collects its own errors; merge once everything has finished.
+    per_worker = await asyncio.gather(
+        *(_apply_worker(base_url, rounds, seed + i) for i in range(apply_workers)),
+        *(_undo_worker(base_url, rounds) for _ in range(undo_workers)),
+        _pending_probe_worker(base_url, rounds * 2),
+    )
+    return [msg for errors in per_worker for msg in errors]
 
 
 def run_stress(base_url: str, apply_workers: int, undo_workers: int, rounds: int, seed: int) -> None:
-    errors: list[str] = []
-    lock = threading.Lock()
-    with concurrent.futures.ThreadPoolExecutor(max_workers=apply_workers + undo_workers + 1) as ex:
-        futures = []
-        for i in range(apply_workers):
-            futures.append(ex.submit(_apply_worker, base_url, rounds, seed + i, errors, lock))
-        for _ in range(undo_workers):
-            futures.append(ex.submit(_undo_worker, base_url, rounds, errors, lock))
-        futures.append(ex.submit(_pending_probe_worker, base_url, rounds * 2, errors, lock))
-        for f in futures:
-            f.result()
+    errors = asyncio.run(_run_stress_async(base_url, apply_workers, undo_workers, rounds, seed))
     if errors:
         raise AssertionError(errors[0])
 
@@ -128,8 +265,11 @@ def main() -> int:
     ap.add_argument("--undo-workers", type=int, default=4)
     args = ap.parse_args()
 
-    cmd = ["python", str(SERVER_PATH), "--host", args.host, "--port", str(args.port)]
-    proc = subprocess.Popen(cmd, cwd=str(REPO_ROOT), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    cmd = [sys.executable, str(SERVER_PATH), "--host", args.host, "--port", str(args.port)]
+    env = os.environ.copy()
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    env.setdefault("PYTHONUNBUFFERED", "1")
+    proc = subprocess.Popen(cmd, cwd=str(REPO_ROOT), env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
     base_url = f"http://{args.host}:{args.port}"
     try:
         _wait_ready(base_url)
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Arcane Interaction Chess: local dev server (stdlib only).
+"""Arcane Interaction Chess: local dev server (stdlib only; uses orjson if installed).
 
 Serves:
 - Static frontend (HTML/CSS/JS)
@@ -19,7 +19,8 @@ Then open:
 from __future__ import annotations
 
 import argparse
-from dataclasses import fields, is_dataclass
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 import json
 import logging
 import os
@@ -30,12 +31,34 @@ from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, HTTPServer
 from socketserver import ThreadingMixIn
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
+from urllib.parse import parse_qs
 import secrets
+import select
 
 
 LOGGER = logging.getLogger("arcane.frontend.server")
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=_ORJSON_OPTS)
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _loads(data: Any) -> Any:
+        # Request bodies arrive as memoryviews over a reused buffer; stdlib json needs bytes.
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 BACKEND_ROOT = REPO_ROOT / "backend"
@@ -44,6 +67,7 @@ BACKEND_ROOT = REPO_ROOT / "backend"
 sys.path.insert(0, str(BACKEND_ROOT))
 
 from arcane_interaction_chess.api import snapshot, dict_to_move, move_to_dict, move_to_uci
+from arcane_interaction_chess.api.serde import snapshot_pieces, move_to_compact
 from arcane_interaction_chess.api.facade import diff as snapshot_diff
 from arcane_interaction_chess.san import to_san
 from arcane_interaction_chess.arcane.game import ArcaneGame
@@ -61,18 +85,33 @@ class RequestReadTimeoutError(ValueError):
     pass
 
 
+# Read once at import; tests and embedders may patch these module attributes.
+_MAX_BYTES = int(os.environ.get("ARCANE_HTTP_MAX", "1000000"))
+_READ_TIMEOUT = float(os.environ.get("ARCANE_HTTP_READ_TIMEOUT", "5.0"))
+_IDLE_TIMEOUT = float(os.environ.get("ARCANE_HTTP_IDLE_TIMEOUT", "15.0"))
+# How long a keep-alive connection may sit between requests before it is closed. The first
+# request on a connection gets the full _IDLE_TIMEOUT. Tradeoff: an idle connection occupies
+# one of the bounded pool's workers, so a long window lets a few idle tabs stall new requests,
+# while a short one means user-driven calls further apart than this reconnect instead of
+# reusing the connection. Polling clients and bursts (page load, apply + state) stay reused.
+_KEEPALIVE_IDLE = float(os.environ.get("ARCANE_HTTP_KEEPALIVE_IDLE", "0.5"))
+_READ_BUF_SIZE = 64 * 1024
+_READ_BUFS = threading.local()
+_DECIDE_SLOTS = threading.BoundedSemaphore(int(os.environ.get("ARCANE_DECIDE_CONCURRENCY", "16")))
+
+
 def _json_read(
     rfile,
     *,
     content_length: Optional[int],
-    max_bytes: int = 1_000_000,
+    max_bytes: Optional[int] = None,
     socket_obj: Optional[socket.socket] = None,
     read_timeout_s: Optional[float] = None,
 ) -> Dict[str, Any]:
     if content_length is None:
         raise ValueError("Missing Content-Length")
 
-    max_allowed = int(os.environ.get("ARCANE_HTTP_MAX", str(max_bytes)))
+    max_allowed = _MAX_BYTES if max_bytes is None else max_bytes
     if content_length < 0:
         raise ValueError("Invalid Content-Length")
     if content_length > max_allowed:
@@ -84,7 +123,21 @@ def _json_read(
         socket_obj.settimeout(read_timeout_s)
 
     try:
-        raw = rfile.read(content_length) if content_length > 0 else b""
+        # Fill a buffer in place instead of letting read() grow and join chunks; typical
+        # bodies reuse this worker thread's buffer rather than allocating a new one.
+        if content_length <= _READ_BUF_SIZE:
+            buf = getattr(_READ_BUFS, "buf", None)
+            if buf is None:
+                buf = _READ_BUFS.buf = bytearray(_READ_BUF_SIZE)
+        else:
+            buf = bytearray(content_length)
+        view = memoryview(buf)[:content_length]
+        off = 0
+        while off < content_length:
+            n = rfile.readinto(view[off:])
+            if not n:
+                raise ValueError("Truncated body")
+            off += n
     except TimeoutError as e:
         raise RequestReadTimeoutError("Request body read timed out") from e
     except socket.timeout as e:
@@ -93,56 +146,103 @@ def _json_read(
         if socket_obj is not None and read_timeout_s is not None:
             socket_obj.settimeout(prev_timeout)
 
-    if not raw:
+    if not content_length:
         return {}
     try:
-        return json.loads(raw.decode("utf-8"))
+        return _loads(view)
     except (UnicodeDecodeError, json.JSONDecodeError, TypeError, ValueError) as e:
         raise ValueError(f"Invalid JSON: {e}")
 
 
 def _json_write(handler: SimpleHTTPRequestHandler, status: int, payload: Dict[str, Any]) -> None:
-    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
-    handler.send_response(status)
-    handler.send_header("Content-Type", "application/json; charset=utf-8")
-    handler.send_header("Cache-Control", "no-store")
-    handler.send_header("Content-Length", str(len(data)))
-    # Same-origin by default; allow localhost tools to talk to it.
-    handler.send_header("Access-Control-Allow-Origin", "*")
-    handler.end_headers()
-    handler.wfile.write(data)
+    _json_write_raw(handler, status, _dumps(payload))
+
+
+# Same-origin by default; allow localhost tools to talk to it.
+_JSON_HEADERS = (
+    b"Content-Type: application/json; charset=utf-8\r\n"
+    b"Cache-Control: no-store\r\n"
+    b"Access-Control-Allow-Origin: *\r\n"
+)
+# Versioned resources (/api/state) may be cached but must be revalidated via ETag.
+_JSON_REVALIDATE_HEADERS = (
+    b"Content-Type: application/json; charset=utf-8\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"Access-Control-Allow-Origin: *\r\n"
+)
+
+
+def _json_write_raw(
+    handler: SimpleHTTPRequestHandler, status: int, data: bytes, headers: bytes = _JSON_HEADERS
+) -> None:
+    """Write an already-encoded JSON body; status line, headers and body go out in one write."""
+    handler.log_request(status)
+    if handler.request_version == "HTTP/0.9":
+        # HTTP/0.9 has no status line or headers at all.
+        handler.wfile.write(data)
+        return
+    head = b"%s %d %s\r\nServer: %s\r\nDate: %s\r\n%s%sContent-Length: %d\r\n\r\n" % (
+        handler.protocol_version.encode("ascii"),
+        status,
+        HTTPStatus(status).phrase.encode("ascii"),
+        handler.version_string().encode("latin-1"),
+        handler.date_time_string().encode("latin-1"),
+        b"Connection: close\r\n" if handler.close_connection else b"",
+        headers,
+        len(data),
+    )
+    handler.wfile.write(head + data)
+
+
+# Error bodies for the common client mistakes, encoded once.
+_ERROR_BODIES = {
+    msg: _dumps({"ok": False, "error": msg})
+    for msg in ("Illegal move", "No moves to undo", "No pending decision", "Pending decision id mismatch")
+}
+
+
+def _etag_matches(headers, etag: str) -> bool:
+    return etag in (t.strip() for t in headers.get("If-None-Match", "").split(","))
 
 
 def _bad(handler: SimpleHTTPRequestHandler, msg: str, status: int = 400) -> None:
-    _json_write(handler, status, {"ok": False, "error": msg})
-
-
-def _defs() -> Dict[str, Any]:
-    elements = [
-        {"id": int(ElementId.WATER), "name": "Water"},
-        {"id": int(ElementId.FIRE), "name": "Fire"},
-        {"id": int(ElementId.EARTH), "name": "Earth"},
-        {"id": int(ElementId.AIR), "name": "Air/Wind"},
-        {"id": int(ElementId.LIGHTNING), "name": "Lightning"},
-    ]
-
-    items = []
-    name_map = {
-        ItemId.MULTITASKERS_SCHEDULE: "Multitasker’s Schedule",
-        ItemId.POISONED_DAGGER: "Poisoned Dagger",
-        ItemId.DUAL_ADEPTS_GLOVES: "Dual Adept’s Gloves",
-        ItemId.TRIPLE_ADEPTS_GLOVES: "Triple Adept’s Gloves",
-        ItemId.HEADMASTER_RING: "Headmaster Ring",
-        ItemId.POT_OF_HUNGER: "Pot of Hunger",
-        ItemId.SOLAR_NECKLACE: "Solar Necklace",
-    }
-    for it, cost in ITEM_SLOT_COST.items():
-        items.append({"id": int(it), "name": name_map.get(it, it.name), "slot_cost": int(cost)})
-    items.sort(key=lambda x: x["id"])
-
-    abilities = []
-    for aid, adef in ABILITY_DEFS.items():
-        abilities.append(
+    data = _ERROR_BODIES.get(msg)
+    if data is None:
+        data = _dumps({"ok": False, "error": msg})
+    _json_write_raw(handler, status, data)
+
+
+_ELEMENTS_DEFN = (
+    {"id": int(ElementId.WATER), "name": "Water"},
+    {"id": int(ElementId.FIRE), "name": "Fire"},
+    {"id": int(ElementId.EARTH), "name": "Earth"},
+    {"id": int(ElementId.AIR), "name": "Air/Wind"},
+    {"id": int(ElementId.LIGHTNING), "name": "Lightning"},
+)
+
+_ITEM_NAMES = {
+    ItemId.MULTITASKERS_SCHEDULE: "Multitasker’s Schedule",
+    ItemId.POISONED_DAGGER: "Poisoned Dagger",
+    ItemId.DUAL_ADEPTS_GLOVES: "Dual Adept’s Gloves",
+    ItemId.TRIPLE_ADEPTS_GLOVES: "Triple Adept’s Gloves",
+    ItemId.HEADMASTER_RING: "Headmaster Ring",
+    ItemId.POT_OF_HUNGER: "Pot of Hunger",
+    ItemId.SOLAR_NECKLACE: "Solar Necklace",
+}
+
+_ITEMS_DEFN = tuple(
+    sorted(
+        (
+            {"id": int(it), "name": _ITEM_NAMES.get(it, it.name), "slot_cost": int(cost)}
+            for it, cost in ITEM_SLOT_COST.items()
+        ),
+        key=lambda x: x["id"],
+    )
+)
+
+_ABILITIES_DEFN = tuple(
+    sorted(
+        (
             {
                 "id": int(aid),
                 "name": adef.name,
@@ -150,25 +250,71 @@ def _defs() -> Dict[str, Any]:
                 "category": adef.category.value,
                 "consumable": bool(adef.consumable),
             }
-        )
-    abilities.sort(key=lambda x: x["id"])
+            for aid, adef in ABILITY_DEFS.items()
+        ),
+        key=lambda x: x["id"],
+    )
+)
 
-    return {"elements": elements, "items": items, "abilities": abilities}
 
+def _build_defs() -> Dict[str, Any]:
+    return {"elements": _ELEMENTS_DEFN, "items": _ITEMS_DEFN, "abilities": _ABILITIES_DEFN}
+
+
+# Definitions are static for the process lifetime; build and encode them once.
+_DEFS = _build_defs()
+_DEFS_JSON = _dumps({"ok": True, "defs": _DEFS})
+
+
+_EARTH_ID = int(ElementId.EARTH)
+
+# Wire encodings for legal-move lists; UCI strings are lossless (remote captures carry "@origin").
+_MOVE_FORMATS = {"dict": move_to_dict, "compact": move_to_compact, "uci": move_to_uci}
+
+
+def _move_format(qs: Dict[str, List[str]]) -> Optional[str]:
+    """`?fmt=` (or the older `?compact=1`) from a parsed query; None if unknown."""
+    fmt = qs.get("fmt", ["compact" if qs.get("compact") == ["1"] else "dict"])[0]
+    return fmt if fmt in _MOVE_FORMATS else None
+
+
+def _tag_move_format(out: Dict[str, Any], fmt: str) -> None:
+    if fmt != "dict":
+        out["fmt"] = fmt
+    if fmt == "compact":
+        out["compact"] = True
+
+_COLOR_NAME: Dict[Color, str] = {Color.WHITE: "WHITE", Color.BLACK: "BLACK"}
+
+
+def _as_int(v: Any) -> int:
+    # JSON numbers arrive as int already; only coerce strings/floats/bools.
+    return v if type(v) is int else int(v)
 
-def _parse_config(obj: Dict[str, Any]) -> PlayerConfig:
-    element_id = int(obj.get("element_id", int(ElementId.EARTH)))
-    element = ElementId(element_id)
 
-    items = [ItemId(int(x)) for x in (obj.get("items") or [])]
+# Plain dict lookups instead of the IntEnum constructor on every newgame slot.
+_ELEMENT_BY_ID = {int(e): e for e in ElementId}
+_ITEM_BY_ID = {int(i): i for i in ItemId}
+_ABILITY_BY_ID = {int(a): a for a in AbilityId}
 
-    abil_slots = []
-    for s in (obj.get("abilities") or []):
-        abil = AbilityId(int(s["ability"]))
-        ptype = s.get("piece_type")
-        if ptype is not None:
-            ptype = str(ptype)
-        abil_slots.append(AbilitySlot(ability=abil, piece_type=ptype))
+
+def _enum_member(table: Dict[int, Any], v: Any, kind: str) -> Any:
+    try:
+        return table[_as_int(v)]
+    except KeyError:
+        raise ValueError(f"{v!r} is not a valid {kind}") from None
+
+
+def _parse_config(obj: Dict[str, Any]) -> PlayerConfig:
+    element = _enum_member(_ELEMENT_BY_ID, obj.get("element_id", _EARTH_ID), "ElementId")
+    items = [_enum_member(_ITEM_BY_ID, x, "ItemId") for x in (obj.get("items") or ())]
+    abil_slots = [
+        AbilitySlot(
+            ability=_enum_member(_ABILITY_BY_ID, s["ability"], "AbilityId"),
+            piece_type=None if s.get("piece_type") is None else str(s["piece_type"]),
+        )
+        for s in (obj.get("abilities") or ())
+    ]
 
     cfg = PlayerConfig(element=element, items=items, abilities=abil_slots)
     cfg.validate()
@@ -181,6 +327,11 @@ class NeedDecision(Exception):
         self.payload = payload
 
 
+def _redo_key(m) -> Tuple[Any, int, int, Any]:
+    """Identity used to exclude the forbidden move from Redo replay options."""
+    return (m.__class__, m.from_sq, m.to_sq, getattr(m, "flags", ()))
+
+
 class InteractiveDecisions:
     """DecisionProvider that can pause the engine and ask the UI."""
 
@@ -258,47 +409,26 @@ class InteractiveDecisions:
 
     def choose_redo_replay(self, game, defender_color, forbidden, legal):
         k = "redo_replay"
+        fk = _redo_key(forbidden)
+        # One pass: every legal move except the forbidden replay is an alternative.
+        alts = [m for m in legal if _redo_key(m) != fk]
         # If no alternative exists, no redo.
-        has_alt = False
-        for m in legal:
-            if (
-                m.__class__ is forbidden.__class__
-                and m.from_sq == forbidden.from_sq
-                and m.to_sq == forbidden.to_sq
-                and getattr(m, "flags", ()) == getattr(forbidden, "flags", ())
-            ):
-                continue
-            has_alt = True
-            break
-        if not has_alt:
+        if not alts:
             return None
 
         if k in self.choices:
             uci = str(self.choices[k])
             for m in legal:
                 if move_to_uci(m) == uci:
-                    if (
-                        m.__class__ is forbidden.__class__
-                        and m.from_sq == forbidden.from_sq
-                        and m.to_sq == forbidden.to_sq
-                        and getattr(m, "flags", ()) == getattr(forbidden, "flags", ())
-                    ):
-                        return None
-                    return m
+                    return None if _redo_key(m) == fk else m
             return None
 
         opts = []
-        for m in legal:
-            if (
-                m.__class__ is forbidden.__class__
-                and m.from_sq == forbidden.from_sq
-                and m.to_sq == forbidden.to_sq
-                and getattr(m, "flags", ()) == getattr(forbidden, "flags", ())
-            ):
-                continue
-            opts.append({"id": move_to_uci(m), "label": move_to_uci(m), "move": move_to_dict(m)})
+        for m in alts:
+            uci = move_to_uci(m)
+            opts.append({"id": uci, "label": uci, "move": move_to_dict(m)})
         ctx = {
-            "side": "WHITE" if defender_color is Color.WHITE else "BLACK",
+            "side": _COLOR_NAME[defender_color],
             "forbidden": move_to_dict(forbidden),
             "forbidden_uci": move_to_uci(forbidden),
         }
@@ -318,12 +448,51 @@ class InteractiveDecisions:
         self._need(k, "Redo triggered: choose an alternate replay move", opts, ctx)
 
 
+class _MoveSerCache:
+    """Per-request memo of move_to_dict/move_to_uci keyed by move identity.
+
+    Entries hold the move itself so its id() cannot be recycled mid-request.
+    """
+
+    __slots__ = ("_dicts", "_ucis")
+
+    def __init__(self) -> None:
+        self._dicts: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+        self._ucis: Dict[int, Tuple[Any, str]] = {}
+
+    def dict(self, m) -> Dict[str, Any]:
+        hit = self._dicts.get(id(m))
+        if hit is None:
+            hit = self._dicts[id(m)] = (m, move_to_dict(m))
+        return hit[1]
+
+    def uci(self, m) -> str:
+        hit = self._ucis.get(id(m))
+        if hit is None:
+            hit = self._ucis[id(m)] = (m, move_to_uci(m))
+        return hit[1]
+
+
+_ENGINE_EPOCHS = itertools.count(1)
+
+
 class ServerEngine:
+    __slots__ = ("decisions", "game", "epoch", "version", "_state_cache", "_state_body", "_legal_cache", "_uid_index", "_uci_index")
+
     def __init__(self, white: PlayerConfig, black: PlayerConfig, rng_seed: int = 1337) -> None:
         self.decisions: DecisionProvider = InteractiveDecisions()
         self.game = ArcaneGame(white=white, black=black, decisions=self.decisions, rng_seed=rng_seed)
         self.game.setup_standard()
         self.game.attach_tracker()
+        # Distinguishes engines (new games) in ETags, since each one restarts at version 0.
+        self.epoch = next(_ENGINE_EPOCHS)
+        # Bumped on every mutation; state() memoizes its snapshot per version.
+        self.version = 0
+        self._state_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._state_body: Optional[Tuple[int, str, bytes]] = None
+        self._legal_cache: Optional[Tuple[int, List[Any], Dict[Any, Any]]] = None
+        self._uid_index: Optional[Tuple[int, Dict[int, Any]]] = None
+        self._uci_index: Optional[Tuple[int, Dict[str, Any]]] = None
 
     @classmethod
     def standard_demo_game(cls) -> "ServerEngine":
@@ -331,107 +500,212 @@ class ServerEngine:
         b = PlayerConfig(element=ElementId.EARTH, items=[], abilities=[])
         return cls(w, b, rng_seed=1337)
 
-    def state(self) -> Dict[str, Any]:
-        return snapshot(self.game)
-
-    def legal_moves(self) -> List[Dict[str, Any]]:
-        return [move_to_dict(m) for m in self.game.legal_moves(self.game.side_to_move)]
+    def bump_version(self) -> None:
+        self.version += 1
 
-    def _notation_for_last_move(self) -> Optional[Dict[str, Any]]:
+    def state(self) -> Dict[str, Any]:
+        """Snapshot of the current position, shared until the next mutation; do not modify."""
+        cached = self._state_cache
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        snap = snapshot(self.game)
+        self._state_cache = (self.version, snap)
+        return snap
+
+    def published_state(self) -> Optional[Dict[str, Any]]:
+        """Lock-free read: the memoized snapshot if it is still current, else None."""
+        cached = self._state_cache
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        return None
+
+    def diff_base(self, full: bool = False) -> Dict[str, Any]:
+        """Pre-mutation snapshot to diff against.
+
+        Reuses the published snapshot when it is current (clients usually fetched it);
+        otherwise the diff only needs the piece list, so skip check/FEN/arcane serialization.
+        """
+        before = self.published_state()
+        if before is None:
+            before = snapshot(self.game) if full else {"pieces": snapshot_pieces(self.game)}
+        return before
+
+    def state_body(self) -> Tuple[str, bytes]:
+        """`(etag, body)` of the encoded `/api/state` response for the current version."""
+        cached = self._state_body
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+        etag = f'W/"{self.epoch}-{self.version}"'
+        body = _dumps({"ok": True, "state": self.state()})
+        self._state_body = (self.version, etag, body)
+        return etag, body
+
+    def published_state_body(self) -> Optional[Tuple[str, bytes]]:
+        """Lock-free read of `(etag, body)` if it is still current; the pair is stored together."""
+        cached = self._state_body
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+        return None
+
+    def _legal(self) -> Tuple[List[Any], Dict[Any, Any]]:
+        cached = self._legal_cache
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+        legal = self.game.legal_moves(self.game.side_to_move)
+        # Moves are frozen dataclasses: the generated __hash__/__eq__ compare class and fields.
+        index = {m: m for m in legal}
+        self._legal_cache = (self.version, legal, index)
+        return legal, index
+
+    def piece_by_uid(self, uid: int) -> Optional[Any]:
+        """Piece with `uid` on the board, via a uid index rebuilt at most once per version."""
+        cached = self._uid_index
+        if cached is None or cached[0] != self.version:
+            cached = self._uid_index = (self.version, {int(p.uid): p for p in self.game.board._pieces.values()})
+        return cached[1].get(uid)
+
+    def legal_move_by_uci(self, uci: str) -> Optional[Any]:
+        """First legal move whose UCI string is `uci`; the UCI index is built once per version."""
+        cached = self._uci_index
+        if cached is None or cached[0] != self.version:
+            index: Dict[str, Any] = {}
+            for m in self._legal()[0]:
+                index.setdefault(move_to_uci(m), m)
+            cached = self._uci_index = (self.version, index)
+        return cached[1].get(uci)
+
+    def legal_move_objects(self) -> List[Any]:
+        """Legal moves for the side to move, shared until the next mutation; do not modify."""
+        return self._legal()[0]
+
+    def legal_moves(self, fmt: str = "dict") -> List[Any]:
+        """Legal moves encoded per `_MOVE_FORMATS` (`dict`, `compact` or `uci`)."""
+        encode = _MOVE_FORMATS[fmt]
+        return [encode(m) for m in self._legal()[0]]
+
+    def _notation_for_last_move(self, moves: Optional[_MoveSerCache] = None) -> Optional[Dict[str, Any]]:
         lm = self.game.last_move
-        if lm is None or not getattr(self.game, "_stack", None):
+        if lm is None or not self.game._stack:
             return None
+        if moves is None:
+            moves = _MoveSerCache()
+        return {"uci": moves.uci(lm), "san": self._san_for_top(lm), "move": moves.dict(lm)}
+
+    def _san_for_top(self, lm: Any) -> str:
+        """SAN of the top-of-stack move; cached in its undo extras at push time when possible."""
+        top = self.game._stack[-1]
+        san = top.extras.get("san") if top.move is lm else None
+        if san is not None:
+            return san
+        # Pushed outside `apply` (decisions, replays): rewind once to compute it.
         self.game.pop_quiet()
         try:
-            return {"uci": move_to_uci(lm), "san": to_san(self.game, lm), "move": move_to_dict(lm)}
+            san = to_san(self.game, lm)
         finally:
             self.game.push_quiet(lm)
+        self.game._stack[-1].extras["san"] = san
+        return san
 
-    def _gather_effects(self) -> List[Dict[str, Any]]:
+    def _gather_effects(self, moves: Optional[_MoveSerCache] = None) -> List[Dict[str, Any]]:
+        """Effects of the last push, ready to serialize.
+
+        Dicts carrying move objects are copied and rewritten; plain ones are shared with the
+        game, so callers must treat the result as read-only.
+        """
+        if moves is None:
+            moves = _MoveSerCache()
         out: List[Dict[str, Any]] = []
-        for e in getattr(self.game, "transient_effects", []) or []:
+        for e in self.game.transient_effects:
+            if e.get("forbidden") is None and e.get("replay") is None and not isinstance(e.get("undone"), list):
+                out.append(e)
+                continue
             ee = dict(e)
             if "forbidden" in ee and ee["forbidden"] is not None:
-                ee["forbidden"] = move_to_dict(ee["forbidden"])
+                ee["forbidden"] = moves.dict(ee["forbidden"])
             if "replay" in ee and ee["replay"] is not None:
-                ee["replay"] = move_to_dict(ee["replay"])
+                ee["replay"] = moves.dict(ee["replay"])
             if "undone" in ee and isinstance(ee["undone"], list):
                 try:
-                    ee["undone_uci"] = [move_to_uci(m) for m in ee["undone"] if m is not None]
-                    ee["undone"] = [move_to_dict(m) for m in ee["undone"] if m is not None]
+                    ee["undone_uci"] = [moves.uci(m) for m in ee["undone"] if m is not None]
+                    ee["undone"] = [moves.dict(m) for m in ee["undone"] if m is not None]
                 except (TypeError, ValueError, KeyError):
                     ee["undone_uci"] = []
                     ee["undone"] = []
                     ee["undone_error"] = "invalid_effect_undone_payload"
             out.append(ee)
-        if getattr(self.game, "_stack", None):
+        if self.game._stack:
             last_undo = self.game._stack[-1]
-            for e in last_undo.extras.get("effects", []) or []:
-                out.append(dict(e))
+            out.extend(last_undo.extras.get("effects") or ())
         return out
 
-    def apply(self, move_dict: Dict[str, Any]) -> Dict[str, Any]:
-        pre_len = len(getattr(self.game, "_stack", []))
-        before = snapshot(self.game)
+    def apply(self, move_dict: Dict[str, Any], full: bool = False, diff: bool = True) -> Dict[str, Any]:
+        """Apply a move; the full `before` snapshot is only built when `full` is set.
+
+        With `diff=False` (and not `full`) no pre-move snapshot is taken and `diff` is omitted.
+        """
+        pre_len = len(self.game._stack)
+        before = self.diff_base(full) if (diff or full) else None
         requested = dict_to_move(move_dict)
 
-        legal = self.game.legal_moves(self.game.side_to_move)
-        m = None
-        if is_dataclass(requested):
-            for candidate in legal:
-                if candidate.__class__ is not requested.__class__:
-                    continue
-                if not is_dataclass(candidate):
-                    continue
-                matches = True
-                for f in fields(candidate):
-                    if getattr(candidate, f.name) != getattr(requested, f.name):
-                        matches = False
-                        break
-                if matches:
-                    m = candidate
-                    break
+        legal_index = self._legal()[1]
+        try:
+            m = legal_index.get(requested)
+        except TypeError:
+            # Unhashable client-supplied field values (e.g. nested flags) cannot match.
+            m = None
         if m is None:
             raise ValueError("Illegal move")
 
-        applied_notation = {"uci": move_to_uci(m), "san": to_san(self.game, m)}
+        moves = _MoveSerCache()
+        applied_notation = {"uci": moves.uci(m), "san": to_san(self.game, m)}
+        # Bump before pushing: even a push rolled back on NeedDecision may touch arcane state.
+        self.bump_version()
         try:
             self.game.push(m)
         except NeedDecision:
             while len(self.game._stack) > pre_len:
                 self.game.pop()
             raise
-        after = snapshot(self.game)
-        d = snapshot_diff(before, after)
+        top = self.game._stack[-1] if self.game._stack else None
+        if top is not None and top.move is m:
+            top.extras["san"] = applied_notation["san"]
+        after = self.state()
         meta = {
-            "applied": move_to_dict(m),
+            "applied": moves.dict(m),
             "applied_notation": applied_notation,
             "result_last_move": after.get("last_move"),
-            "result_last_notation": self._notation_for_last_move(),
-            "effects": self._gather_effects(),
+            "result_last_notation": self._notation_for_last_move(moves),
+            "effects": self._gather_effects(moves),
             "check": after.get("check"),
             "checkmate": after.get("checkmate"),
         }
-        return {"before": before, "after": after, "diff": d, "meta": meta}
+        out = {"after": after, "meta": meta, "v": self.version}
+        if before is not None:
+            out["diff"] = snapshot_diff(before, after)
+        if full:
+            out["before"] = before
+        return out
 
-    def undo(self) -> Dict[str, Any]:
+    def undo(self, full: bool = False) -> Dict[str, Any]:
+        """Undo one ply; like `apply`, `before` is only returned when `full` is set."""
         if not self.game._stack:
             raise ValueError("No moves to undo")
-        before = snapshot(self.game)
+        before = self.diff_base(full)
         undone_move = self.game.last_move
         undone_meta = None
-        if undone_move is not None and getattr(self.game, "_stack", None):
+        if undone_move is not None:
             last_undo = self.game._stack[-1]
             undone_meta = {"move": move_to_dict(undone_move), "uci": move_to_uci(undone_move)}
-            self.game.pop_quiet()
-            try:
-                undone_meta["san"] = to_san(self.game, undone_move)
-            finally:
-                self.game.push_quiet(undone_move)
-            undone_meta["effects"] = [dict(e) for e in last_undo.extras.get("effects", []) or []]
+            undone_meta["san"] = self._san_for_top(undone_move)
+            # Same read-only contract as _gather_effects: the flat effect dicts are shared, not copied.
+            undone_meta["effects"] = list(last_undo.extras.get("effects") or ())
+        self.bump_version()
         self.game.pop()
-        after = snapshot(self.game)
-        return {"before": before, "after": after, "diff": snapshot_diff(before, after), "meta": {"undone": undone_meta}}
+        after = self.state()
+        out = {"after": after, "diff": snapshot_diff(before, after), "meta": {"undone": undone_meta}, "v": self.version}
+        if full:
+            out["before"] = before
+        return out
 
 
 class _State:
@@ -445,14 +719,91 @@ class _State:
         self.pending_move = None
 
 STATE = _State()
-STATE_LOCK = threading.RLock()
+# Never re-acquired while held: handlers take it once around engine access.
+STATE_LOCK = threading.Lock()
 
 
 class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
     daemon_threads = True
 
 
+def _http_pool_size() -> int:
+    # A connection holds a worker while it is open (up to _IDLE_TIMEOUT for its first request,
+    # _KEEPALIVE_IDLE between later ones); leave room for a browser's parallel asset connections.
+    default = max(8, min(32, (os.cpu_count() or 1) * 2))
+    try:
+        size = int(os.environ.get("ARCANE_HTTP_THREADS", str(default)))
+    except ValueError:
+        return default
+    return max(1, size)
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """Dispatch connections to a bounded worker pool instead of a thread per request.
+
+    Pool size defaults to 2 * cpu_count clamped to [8, 32] and can be overridden with
+    ARCANE_HTTP_THREADS. The accept loop blocks while every worker is busy, so
+    excess connections wait in the kernel backlog rather than an unbounded queue.
+    """
+
+    def __init__(self, server_address, RequestHandlerClass, bind_and_activate: bool = True) -> None:
+        size = _http_pool_size()
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="arcane-http")
+        self._slots = threading.BoundedSemaphore(size)
+        super().__init__(server_address, RequestHandlerClass, bind_and_activate)
+
+    def process_request(self, request, client_address) -> None:
+        self._slots.acquire()
+        try:
+            self.executor.submit(self._process_and_release, request, client_address)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _process_and_release(self, request, client_address) -> None:
+        try:
+            self.process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
 class Handler(SimpleHTTPRequestHandler):
+    # Read timeout for the first request and for any request that has started arriving; idle
+    # gaps between keep-alive requests are bounded separately by _KEEPALIVE_IDLE in `handle`.
+    timeout = _IDLE_TIMEOUT
+    # Small JSON replies should not wait on Nagle coalescing.
+    disable_nagle_algorithm = True
+    # Keep-alive: page assets and API polls reuse one connection. Every response sets Content-Length.
+    protocol_version = "HTTP/1.1"
+    # Set only while SimpleHTTPRequestHandler.send_head writes a static file's headers.
+    _static_etag: Optional[str] = None
+    # Request path split once at entry by `_parse_path`: route without query, raw query string.
+    _route: str = ""
+    _qs: str = ""
+
+    def handle(self) -> None:
+        # Like BaseHTTPRequestHandler.handle, but once a request has been served, give up on a
+        # silent connection after _KEEPALIVE_IDLE so idle keep-alive clients cannot starve the pool.
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._await_request():
+            self.handle_one_request()
+
+    def _await_request(self) -> bool:
+        """True once the next keep-alive request has started arriving within _KEEPALIVE_IDLE."""
+        self.connection.settimeout(_KEEPALIVE_IDLE)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            # Timed out or reset: close quietly, there is no request to answer.
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
     # Serve files from frontend/ as the web root
     def translate_path(self, path: str) -> str:
         # static root = this directory
@@ -467,6 +818,66 @@ class Handler(SimpleHTTPRequestHandler):
             target = target / "index.html"
         return str(target)
 
+    def _parse_path(self) -> None:
+        p = self.path
+        i = p.find("?")
+        if i < 0:
+            self._route, self._qs = p, ""
+        else:
+            self._route, self._qs = p[:i], p[i + 1:]
+
+    def send_head(self):
+        # Static assets: answer revalidations from a stat() alone, without opening the file.
+        path = self.translate_path(self._route)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return super().send_head()
+        etag = f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        if _etag_matches(self.headers, etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return None
+        self._static_etag = etag
+        try:
+            return super().send_head()
+        finally:
+            self._static_etag = None
+
+    def end_headers(self) -> None:
+        if self._static_etag is not None:
+            self.send_header("ETag", self._static_etag)
+        super().end_headers()
+
+    def copyfile(self, source, outputfile) -> None:
+        # Static assets: let the kernel copy file -> socket instead of shutil.copyfileobj.
+        try:
+            in_fd = source.fileno()
+            out_fd = outputfile.fileno()
+            offset = source.tell()
+            remaining = os.fstat(in_fd).st_size - offset
+        except (AttributeError, OSError, ValueError):
+            return super().copyfile(source, outputfile)
+        sent_any = False
+        while remaining > 0:
+            try:
+                sent = os.sendfile(out_fd, in_fd, offset, remaining)
+            except BlockingIOError:
+                # The socket has a timeout, so it is non-blocking underneath.
+                if not select.select([], [out_fd], [], self.timeout)[1]:
+                    raise TimeoutError("sendfile timed out")
+                continue
+            except OSError:
+                if sent_any:
+                    raise
+                return super().copyfile(source, outputfile)
+            if sent == 0:
+                break
+            sent_any = True
+            offset += sent
+            remaining -= sent
+
     def do_OPTIONS(self) -> None:
         self.send_response(HTTPStatus.NO_CONTENT)
         self.send_header("Access-Control-Allow-Origin", "*")
@@ -475,52 +886,50 @@ class Handler(SimpleHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self) -> None:
-        if self.path.startswith("/api/"):
+        self._parse_path()
+        if self._route.startswith("/api/"):
             self._handle_api_get()
             return
         return super().do_GET()
 
+    def do_HEAD(self) -> None:
+        self._parse_path()
+        return super().do_HEAD()
+
     def do_POST(self) -> None:
-        if self.path.startswith("/api/"):
+        self._parse_path()
+        if self._route.startswith("/api/"):
             self._handle_api_post()
             return
         self.send_error(HTTPStatus.NOT_FOUND, "No such endpoint")
 
     def _handle_api_get(self) -> None:
-        try:
-            if self.path.startswith("/api/defs"):
-                _json_write(self, 200, {"ok": True, "defs": _defs()})
-                return
-            if self.path.startswith("/api/state"):
-                with STATE_LOCK:
-                    state = STATE.engine.state()
-                _json_write(self, 200, {"ok": True, "state": state})
-                return
-            if self.path.startswith("/api/legal"):
-                with STATE_LOCK:
-                    moves = STATE.engine.legal_moves()
-                _json_write(self, 200, {"ok": True, "moves": moves})
-                return
-            if self.path.startswith("/api/pending"):
-                with STATE_LOCK:
-                    pending = STATE.pending
-                _json_write(self, 200, {"ok": True, "pending": pending})
-                return
-        except (TypeError, ValueError, KeyError) as e:
-            _bad(self, str(e), 500)
+        route = _GET_ROUTES.get(self._route)
+        if route is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "No such endpoint")
             return
+        try:
+            route(self)
+        except ValueError as e:
+            # Route handlers and the engine raise ValueError for bad client input; anything else,
+            # KeyError included, is a server bug and is logged as a 500.
+            _bad(self, str(e), 400)
         except Exception:
             LOGGER.exception("api_get_unhandled", extra={"path": self.path})
             _bad(self, "Internal server error", 500)
-            return
-
-        self.send_error(HTTPStatus.NOT_FOUND, "No such endpoint")
 
     def _handle_api_post(self) -> None:
+        route = _POST_ROUTES.get(self._route)
+        if route is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "No such endpoint")
+            return
+
         try:
             length_header = self.headers.get("Content-Length")
             length = int(length_header) if length_header is not None else None
         except (TypeError, ValueError):
+            # The body length is unknown, so the stream cannot be resynchronized for keep-alive.
+            self.close_connection = True
             _bad(self, "Invalid Content-Length", 400)
             return
 
@@ -529,18 +938,25 @@ class Handler(SimpleHTTPRequestHandler):
                 self.rfile,
                 content_length=length,
                 socket_obj=self.connection,
-                read_timeout_s=float(os.environ.get("ARCANE_HTTP_READ_TIMEOUT", "5.0")),
+                read_timeout_s=_READ_TIMEOUT,
             )
         except PayloadTooLargeError as e:
+            # The oversized body is left unread; drop the connection rather than parse it as a request.
+            self.close_connection = True
             _bad(self, str(e), 413)
             return
         except RequestReadTimeoutError as e:
+            self.close_connection = True
             _bad(self, str(e), 408)
             return
         except ValueError as e:
             msg = str(e)
             if msg == "Missing Content-Length":
+                self.close_connection = True
                 _bad(self, msg, 411)
+            elif msg == "Invalid Content-Length":
+                self.close_connection = True
+                _bad(self, msg, 400)
             else:
                 _bad(self, msg, 400)
             return
@@ -553,248 +969,374 @@ class Handler(SimpleHTTPRequestHandler):
             return
 
         try:
-            if self.path.startswith("/api/reset"):
-                with STATE_LOCK:
-                    STATE.engine = ServerEngine.standard_demo_game()
-                    STATE.pending = None
-                    STATE.pending_move = None
-                    state = STATE.engine.state()
-                _json_write(self, 200, {"ok": True, "state": state})
+            route(self, body)
+        except ValueError as e:
+            # Route handlers and the engine raise ValueError for bad client input; anything else,
+            # KeyError included, is a server bug and is logged as a 500.
+            _bad(self, str(e), 400)
+        except Exception:
+            LOGGER.exception("api_post_unhandled", extra={"path": self.path})
+            _bad(self, "Internal server error", 500)
+
+    def _api_defs(self) -> None:
+        _json_write_raw(self, 200, _DEFS_JSON)
+
+    def _api_state(self) -> None:
+        entry = STATE.engine.published_state_body()
+        if entry is None:
+            with STATE_LOCK:
+                entry = STATE.engine.state_body()
+        etag, data = entry
+        if _etag_matches(self.headers, etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+        _json_write_raw(self, 200, data, _JSON_REVALIDATE_HEADERS + b"ETag: %s\r\n" % etag.encode("ascii"))
+
+    def _api_legal(self) -> None:
+        fmt = _move_format(parse_qs(self._qs))
+        if fmt is None:
+            _bad(self, "Unknown move format")
+            return
+        with STATE_LOCK:
+            moves = STATE.engine.legal_moves(fmt)
+        out: Dict[str, Any] = {"ok": True, "moves": moves}
+        _tag_move_format(out, fmt)
+        _json_write(self, 200, out)
+
+    def _api_bundle(self) -> None:
+        """`state`, `legal` and `pending` (or the subset named in `?parts=`) from one consistent read."""
+        qs = parse_qs(self._qs)
+        parts = set(qs.get("parts", ["state,legal,pending"])[0].split(","))
+        unknown = parts - _BUNDLE_PARTS
+        if unknown:
+            _bad(self, f"Unknown bundle parts: {', '.join(sorted(unknown))}")
+            return
+        fmt = _move_format(qs)
+        if fmt is None:
+            _bad(self, "Unknown move format")
+            return
+        out: Dict[str, Any] = {"ok": True}
+        with STATE_LOCK:
+            eng = STATE.engine
+            if "state" in parts:
+                out["state"] = eng.state()
+            if "legal" in parts:
+                out["moves"] = eng.legal_moves(fmt)
+                _tag_move_format(out, fmt)
+            if "pending" in parts:
+                out["pending"] = STATE.pending
+            out["v"] = eng.version
+        _json_write(self, 200, out)
+
+    def _api_pending(self) -> None:
+        # Writers replace STATE.pending wholesale, so a bare reference read is consistent.
+        pending = STATE.pending
+        _json_write(self, 200, {"ok": True, "pending": pending})
+
+    def _api_reset(self, body: Dict[str, Any]) -> None:
+        with STATE_LOCK:
+            STATE.engine = ServerEngine.standard_demo_game()
+            STATE.pending = None
+            STATE.pending_move = None
+            state = STATE.engine.state()
+        _json_write(self, 200, {"ok": True, "state": state})
+
+    def _api_newgame(self, body: Dict[str, Any]) -> None:
+        try:
+            white = _parse_config(body.get("white") or {})
+        except ValueError as e:
+            _bad(self, f"Invalid white config: {e}", 400)
+            return
+        try:
+            black = _parse_config(body.get("black") or {})
+        except ValueError as e:
+            _bad(self, f"Invalid black config: {e}", 400)
+            return
+        try:
+            seed = int(body.get("rng_seed", 1337))
+        except (TypeError, ValueError):
+            _bad(self, "Invalid rng_seed: expected integer", 400)
+            return
+        try:
+            next_engine = ServerEngine(white=white, black=black, rng_seed=seed)
+        except ValueError as e:
+            _bad(self, f"Invalid new game configuration: {e}", 400)
+            return
+        with STATE_LOCK:
+            STATE.engine = next_engine
+            STATE.pending = None
+            STATE.pending_move = None
+            state = STATE.engine.state()
+        _json_write(self, 200, {"ok": True, "state": state})
+
+    def _api_apply(self, body: Dict[str, Any]) -> None:
+        mv = body.get("move")
+        if not isinstance(mv, dict):
+            _bad(self, "Missing move dict")
+            return
+        qs = parse_qs(self._qs)
+        full = qs.get("full") == ["1"]
+        diff = qs.get("diff") != ["0"]
+        with STATE_LOCK:
+            eng = STATE.engine
+            if STATE.pending is not None:
+                _bad(self, "Decision pending: resolve /api/decide or /api/cancel")
+                return
+            eng.decisions.clear()
+            try:
+                res = eng.apply(mv, full=full, diff=diff)
+            except ValueError as e:
+                _bad(self, str(e), 400)
+                return
+            except NeedDecision as nd:
+                pending = _open_pending(nd, mv)
+                state = eng.state()
+            else:
+                _json_write(self, 200, {"ok": True, "result": res})
                 return
+        _json_write(self, 200, {"ok": True, "pending": pending, "state": state})
 
-            if self.path.startswith("/api/newgame"):
+    def _api_apply_batch(self, body: Dict[str, Any]) -> None:
+        moves = body.get("moves")
+        if not isinstance(moves, list) or not moves or not all(isinstance(mv, dict) for mv in moves):
+            _bad(self, "Missing moves list")
+            return
+        metas: List[Dict[str, Any]] = []
+        with STATE_LOCK:
+            if STATE.pending is not None:
+                _bad(self, "Decision pending: resolve /api/decide or /api/cancel")
+                return
+            eng = STATE.engine
+            for i, mv in enumerate(moves):
+                eng.decisions.clear()
                 try:
-                    white = _parse_config(body.get("white") or {})
+                    # Batches report per-move meta only, so skip the snapshot diff.
+                    res = eng.apply(mv, diff=False)
                 except ValueError as e:
-                    _bad(self, f"Invalid white config: {e}", 400)
+                    # Moves before `i` stay applied; report where the batch stopped.
+                    out = {"ok": False, "error": str(e), "index": i, "metas": metas, "state": eng.state()}
+                    status = 400
+                    break
+                except NeedDecision as nd:
+                    pending = _open_pending(nd, mv)
+                    out = {"ok": True, "pending": pending, "index": i, "metas": metas, "state": eng.state()}
+                    status = 200
+                    break
+                meta = res["meta"]
+                metas.append({
+                    "applied": meta["applied"],
+                    "notation": meta["result_last_notation"],
+                    "effects": meta["effects"],
+                    "check": meta["check"],
+                    "checkmate": meta["checkmate"],
+                })
+            else:
+                out = {"ok": True, "metas": metas, "state": eng.state()}
+                status = 200
+        _json_write(self, status, out)
+
+    def _api_decide(self, body: Dict[str, Any]) -> None:
+        # Shed load instead of queueing unbounded decide work behind the engine lock.
+        if not _DECIDE_SLOTS.acquire(blocking=False):
+            _bad(self, "Server busy: too many concurrent decisions", 503)
+            return
+        try:
+            self._decide(body)
+        finally:
+            _DECIDE_SLOTS.release()
+
+    def _api_cancel(self, body: Dict[str, Any]) -> None:
+        with STATE_LOCK:
+            STATE.pending = None
+            STATE.pending_move = None
+            STATE.engine.decisions.clear()
+            state = STATE.engine.state()
+        _json_write(self, 200, {"ok": True, "state": state})
+
+    def _api_undo(self, body: Dict[str, Any]) -> None:
+        with STATE_LOCK:
+            eng = STATE.engine
+            STATE.pending = None
+            STATE.pending_move = None
+            eng.decisions.clear()
+            try:
+                res = eng.undo()
+            except ValueError as e:
+                _bad(self, str(e), 400)
+                return
+        _json_write(self, 200, {"ok": True, "result": res})
+
+    def _api_solar_topup(self, body: Dict[str, Any]) -> None:
+        kind = str(body.get("kind", "redo")).lower()
+        uid = body.get("uid")
+        with STATE_LOCK:
+            eng = STATE.engine
+            if STATE.pending is not None:
+                _bad(self, "Decision pending: resolve before using Solar Necklace")
+                return
+
+            g = eng.game
+            st = g.arcane_state
+            c = g.side_to_move
+            cfg = g.player_config[c]
+
+            if not cfg.has_item(ItemId.SOLAR_NECKLACE):
+                _bad(self, "Solar Necklace not equipped")
+                return
+            if st.solar_uses[c] <= 0:
+                _bad(self, "No Solar uses remaining")
+                return
+
+            before = eng.diff_base()
+            try:
+                g.transient_effects.clear()
+            except (AttributeError, TypeError) as e:
+                _bad(self, f"Unable to clear transient effects: {e}", 500)
+                return
+
+            if kind == "necro":
+                if int(st.necro_max[c]) <= 0:
+                    _bad(self, "Necromancer is not equipped for this side")
                     return
-                try:
-                    black = _parse_config(body.get("black") or {})
-                except ValueError as e:
-                    _bad(self, f"Invalid black config: {e}", 400)
+                if int(st.necro_pool[c]) >= int(st.necro_max[c]):
+                    _bad(self, "Necromancer pool already full")
                     return
-                try:
-                    seed = int(body.get("rng_seed", 1337))
-                except (TypeError, ValueError):
-                    _bad(self, "Invalid rng_seed: expected integer", 400)
+                st.necro_bonus[c] = int(st.necro_bonus.get(c, 0)) + 1
+                st.necro_max[c] = int(st.necro_max[c]) + 1
+                st.necro_pool[c] = int(st.necro_pool[c]) + 1
+                g.transient_effects.append({"type": "solar_topup", "kind": "necro", "side": _COLOR_NAME[c]})
+            else:
+                if uid is None:
+                    _bad(self, "uid required for redo topup")
                     return
-                try:
-                    next_engine = ServerEngine(white=white, black=black, rng_seed=seed)
-                except ValueError as e:
-                    _bad(self, f"Invalid new game configuration: {e}", 400)
+                uid = int(uid)
+                p = eng.piece_by_uid(uid)
+                if p is None or p.color is not c:
+                    _bad(self, "Invalid target piece")
                     return
-                with STATE_LOCK:
-                    STATE.engine = next_engine
-                    STATE.pending = None
-                    STATE.pending_move = None
-                    state = STATE.engine.state()
-                _json_write(self, 200, {"ok": True, "state": state})
-                return
-
-            if self.path.startswith("/api/apply"):
-                mv = body.get("move")
-                if not isinstance(mv, dict):
-                    _bad(self, "Missing move dict")
+                if st.redo_max.get(uid, 0) <= 0:
+                    _bad(self, "Target piece has no Redo charges")
                     return
-                with STATE_LOCK:
-                    if STATE.pending is not None:
-                        _bad(self, "Decision pending: resolve /api/decide or /api/cancel")
-                        return
-                    STATE.engine.decisions.clear()
-                    try:
-                        res = STATE.engine.apply(mv)
-                    except ValueError as e:
-                        _bad(self, str(e), 400)
-                        return
-                    except NeedDecision as nd:
-                        pid = secrets.token_urlsafe(10)
-                        kind = str(nd.payload.get("kind"))
-                        STATE.pending_move = None if kind == "redo_replay" else mv
-                        STATE.pending = {"id": pid, **nd.payload}
-                        pending = STATE.pending
-                        state = STATE.engine.state()
-                    else:
-                        _json_write(self, 200, {"ok": True, "result": res})
-                        return
-                _json_write(self, 200, {"ok": True, "pending": pending, "state": state})
+                if st.redo_charges.get(uid, 0) >= st.redo_max.get(uid, 0):
+                    _bad(self, "Redo charges already full")
+                    return
+                st.redo_charges[uid] = min(int(st.redo_charges.get(uid, 0)) + 1, int(st.redo_max.get(uid, 0)))
+                g.transient_effects.append({"type": "solar_topup", "kind": "redo", "side": _COLOR_NAME[c], "uid": uid})
+
+            st.solar_uses[c] = int(st.solar_uses[c]) - 1
+            eng.bump_version()
+
+            after = eng.state()
+            d = snapshot_diff(before, after)
+            meta = {
+                "applied": None,
+                "applied_notation": None,
+                "result_last_move": after.get("last_move"),
+                "result_last_notation": eng._notation_for_last_move(),
+                "effects": eng._gather_effects(),
+                "check": after.get("check"),
+                "checkmate": after.get("checkmate"),
+            }
+            version = eng.version
+        _json_write(self, 200, {"ok": True, "result": {"after": after, "diff": d, "meta": meta, "v": version}})
+
+    def _decide(self, body: Dict[str, Any]) -> None:
+        pid = body.get("id")
+        choice = body.get("choice")
+        with STATE_LOCK:
+            eng = STATE.engine
+            if STATE.pending is None:
+                _bad(self, "No pending decision")
+                return
+            if str(pid) != str(STATE.pending.get("id")):
+                _bad(self, "Pending decision id mismatch")
                 return
 
-            if self.path.startswith("/api/decide"):
-                pid = body.get("id")
-                choice = body.get("choice")
-                with STATE_LOCK:
-                    if STATE.pending is None:
-                        _bad(self, "No pending decision")
-                        return
-                    if str(pid) != str(STATE.pending.get("id")):
-                        _bad(self, "Pending decision id mismatch")
+            kind = str(STATE.pending.get("kind"))
+            eng.decisions.choices[kind] = choice
+            try:
+                if STATE.pending_move is None and kind == "redo_replay":
+                    g = eng.game
+                    chosen = eng.legal_move_by_uci(str(choice))
+                    if chosen is None:
+                        _bad(self, "Invalid redo replay choice")
                         return
 
-                    kind = str(STATE.pending.get("kind"))
-                    STATE.engine.decisions.choices[kind] = choice
-                    try:
-                        if STATE.pending_move is None and kind == "redo_replay":
-                            g = STATE.engine.game
-                            chosen = None
-                            for m in g.legal_moves(g.side_to_move):
-                                if move_to_uci(m) == str(choice):
-                                    chosen = m
-                                    break
-                            if chosen is None:
-                                _bad(self, "Invalid redo replay choice")
-                                return
-
-                            pr = getattr(g, "_pending_redo", None)
-                            if isinstance(pr, dict):
-                                for e in reversed(getattr(g, "transient_effects", []) or []):
-                                    if e.get("type") == "redo_pending" and int(e.get("spent_uid", -1)) == int(pr.get("spent_uid", -2)):
-                                        e["type"] = "redo"
-                                        e["replay"] = chosen
-                                        break
-
-                            mv_dict = move_to_dict(chosen)
-                            res = STATE.engine.apply(mv_dict)
-                            STATE.pending = None
-                            STATE.pending_move = None
-                            if hasattr(g, "_pending_redo"):
-                                setattr(g, "_pending_redo", None)
-                            _json_write(self, 200, {"ok": True, "result": res})
-                            return
-
-                        if STATE.pending_move is None:
-                            _bad(self, "No pending move to apply")
-                            return
-                        res = STATE.engine.apply(STATE.pending_move)
-                        STATE.pending = None
-                        STATE.pending_move = None
-                        _json_write(self, 200, {"ok": True, "result": res})
-                        return
-                    except ValueError as e:
-                        _bad(self, str(e), 400)
-                        return
-                    except NeedDecision as nd:
-                        STATE.pending.update({k: v for k, v in nd.payload.items() if k != "kind"})
-                        STATE.pending["kind"] = nd.payload.get("kind")
-                        if STATE.pending_move is None and kind == "redo_replay":
-                            g = STATE.engine.game
-                            for m in g.legal_moves(g.side_to_move):
-                                if move_to_uci(m) == str(choice):
-                                    STATE.pending_move = move_to_dict(m)
-                                    break
-                        pending = STATE.pending
-                        state = STATE.engine.state()
-                _json_write(self, 200, {"ok": True, "pending": pending, "state": state})
-                return
+                    pr = getattr(g, "_pending_redo", None)
+                    if isinstance(pr, dict):
+                        for e in reversed(getattr(g, "transient_effects", []) or []):
+                            if e.get("type") == "redo_pending" and int(e.get("spent_uid", -1)) == int(pr.get("spent_uid", -2)):
+                                e["type"] = "redo"
+                                e["replay"] = chosen
+                                break
 
-            if self.path.startswith("/api/cancel"):
-                with STATE_LOCK:
+                    mv_dict = move_to_dict(chosen)
+                    res = eng.apply(mv_dict)
                     STATE.pending = None
                     STATE.pending_move = None
-                    STATE.engine.decisions.clear()
-                    state = STATE.engine.state()
-                _json_write(self, 200, {"ok": True, "state": state})
-                return
+                    if hasattr(g, "_pending_redo"):
+                        setattr(g, "_pending_redo", None)
+                    _json_write(self, 200, {"ok": True, "result": res})
+                    return
 
-            if self.path.startswith("/api/undo"):
-                with STATE_LOCK:
-                    STATE.pending = None
-                    STATE.pending_move = None
-                    STATE.engine.decisions.clear()
-                    try:
-                        res = STATE.engine.undo()
-                    except ValueError as e:
-                        _bad(self, str(e), 400)
-                        return
+                if STATE.pending_move is None:
+                    _bad(self, "No pending move to apply")
+                    return
+                res = eng.apply(STATE.pending_move)
+                STATE.pending = None
+                STATE.pending_move = None
                 _json_write(self, 200, {"ok": True, "result": res})
                 return
-
-            if self.path.startswith("/api/solar_topup"):
-                kind = str(body.get("kind", "redo")).lower()
-                uid = body.get("uid")
-                with STATE_LOCK:
-                    if STATE.pending is not None:
-                        _bad(self, "Decision pending: resolve before using Solar Necklace")
-                        return
-
-                    g = STATE.engine.game
-                    st = g.arcane_state
-                    c = g.side_to_move
-                    cfg = g.player_config[c]
-
-                    if not cfg.has_item(ItemId.SOLAR_NECKLACE):
-                        _bad(self, "Solar Necklace not equipped")
-                        return
-                    if st.solar_uses[c] <= 0:
-                        _bad(self, "No Solar uses remaining")
-                        return
-
-                    before = snapshot(g)
-                    try:
-                        g.transient_effects.clear()
-                    except (AttributeError, TypeError) as e:
-                        _bad(self, f"Unable to clear transient effects: {e}", 500)
-                        return
-
-                    if kind == "necro":
-                        if int(st.necro_max[c]) <= 0:
-                            _bad(self, "Necromancer is not equipped for this side")
-                            return
-                        if int(st.necro_pool[c]) >= int(st.necro_max[c]):
-                            _bad(self, "Necromancer pool already full")
-                            return
-                        st.necro_bonus[c] = int(st.necro_bonus.get(c, 0)) + 1
-                        st.necro_max[c] = int(st.necro_max[c]) + 1
-                        st.necro_pool[c] = int(st.necro_pool[c]) + 1
-                        g.transient_effects.append({"type": "solar_topup", "kind": "necro", "side": "WHITE" if c is Color.WHITE else "BLACK"})
-                    else:
-                        if uid is None:
-                            _bad(self, "uid required for redo topup")
-                            return
-                        uid = int(uid)
-                        p = g.board._pieces.get(next((sq for sq, pp in g.board._pieces.items() if int(pp.uid) == uid), -1))
-                        if p is None:
-                            for pp in g.board._pieces.values():
-                                if int(pp.uid) == uid:
-                                    p = pp
-                                    break
-                        if p is None or p.color is not c:
-                            _bad(self, "Invalid target piece")
-                            return
-                        if st.redo_max.get(uid, 0) <= 0:
-                            _bad(self, "Target piece has no Redo charges")
-                            return
-                        if st.redo_charges.get(uid, 0) >= st.redo_max.get(uid, 0):
-                            _bad(self, "Redo charges already full")
-                            return
-                        st.redo_charges[uid] = min(int(st.redo_charges.get(uid, 0)) + 1, int(st.redo_max.get(uid, 0)))
-                        g.transient_effects.append({"type": "solar_topup", "kind": "redo", "side": "WHITE" if c is Color.WHITE else "BLACK", "uid": uid})
-
-                    st.solar_uses[c] = int(st.solar_uses[c]) - 1
-
-                    after = snapshot(g)
-                    d = snapshot_diff(before, after)
-                    meta = {
-                        "applied": None,
-                        "applied_notation": None,
-                        "result_last_move": after.get("last_move"),
-                        "result_last_notation": STATE.engine._notation_for_last_move(),
-                        "effects": STATE.engine._gather_effects(),
-                        "check": after.get("check"),
-                        "checkmate": after.get("checkmate"),
-                    }
-                _json_write(self, 200, {"ok": True, "result": {"before": before, "after": after, "diff": d, "meta": meta}})
+            except ValueError as e:
+                _bad(self, str(e), 400)
                 return
-
-        except (TypeError, ValueError, KeyError) as e:
-            _bad(self, str(e), 500)
-            return
-        except Exception:
-            LOGGER.exception("api_post_unhandled", extra={"path": self.path})
-            _bad(self, "Internal server error", 500)
-            return
-
-        self.send_error(HTTPStatus.NOT_FOUND, "No such endpoint")
-
+            except NeedDecision as nd:
+                updated = dict(STATE.pending)
+                updated.update({k: v for k, v in nd.payload.items() if k != "kind"})
+                updated["kind"] = nd.payload.get("kind")
+                STATE.pending = updated
+                if STATE.pending_move is None and kind == "redo_replay":
+                    m = eng.legal_move_by_uci(str(choice))
+                    if m is not None:
+                        STATE.pending_move = move_to_dict(m)
+                pending = STATE.pending
+                state = eng.state()
+        _json_write(self, 200, {"ok": True, "pending": pending, "state": state})
+
+
+
+_BUNDLE_PARTS = frozenset(("state", "legal", "pending"))
+
+
+def _open_pending(nd: NeedDecision, mv: Dict[str, Any]) -> Dict[str, Any]:
+    """Record a new pending decision for `mv`; caller holds STATE_LOCK."""
+    kind = str(nd.payload.get("kind"))
+    STATE.pending_move = None if kind == "redo_replay" else mv
+    STATE.pending = {"id": secrets.token_urlsafe(10), **nd.payload}
+    return STATE.pending
+
+
+_GET_ROUTES = {
+    "/api/defs": Handler._api_defs,
+    "/api/state": Handler._api_state,
+    "/api/legal": Handler._api_legal,
+    "/api/pending": Handler._api_pending,
+    "/api/bundle": Handler._api_bundle,
+}
+
+_POST_ROUTES = {
+    "/api/reset": Handler._api_reset,
+    "/api/newgame": Handler._api_newgame,
+    "/api/apply": Handler._api_apply,
+    "/api/apply_batch": Handler._api_apply_batch,
+    "/api/decide": Handler._api_decide,
+    "/api/cancel": Handler._api_cancel,
+    "/api/undo": Handler._api_undo,
+    "/api/solar_topup": Handler._api_solar_topup,
+}
 
 
 def main() -> int:
@@ -805,9 +1347,9 @@ def main() -> int:
 
     os.chdir(Path(__file__).resolve().parent)
 
-    httpd = ThreadingHTTPServer((args.host, args.port), Handler)
+    httpd = PooledHTTPServer((args.host, args.port), Handler)
     print(f"Arcane Chess frontend at http://{args.host}:{args.port}/")
-    print("API: /api/state /api/legal /api/apply /api/decide /api/pending /api/cancel /api/undo /api/newgame /api/defs")
+    print("API: /api/state /api/legal /api/apply /api/apply_batch /api/decide /api/pending /api/bundle /api/cancel /api/undo /api/newgame /api/defs")
     httpd.serve_forever()
     return 0
 